@@ -0,0 +1,179 @@
+"""
+Headless batch report generator of the Titanic survival metrics, for many dataset files at once (e.g. nightly),
+without Streamlit.
+
+Each file is read in chunks into its survival cube (see Titanic_Dataset_Reports_Creator_Data), from which the
+metrics of the dashboard and the passenger count, survivor count, survival rate and average age of every
+Sex, Embarked, Passenger Class and Age Band category (and of the Minors age group) are computed together, the same
+groups the dashboard shows. Files are processed in parallel in a process pool.
+
+For each file <name>.csv the output directory gets, under the file's directory relative to the common
+directory of all the files (so files of the same name in different directories never overwrite each other):
+* <name>_survival_report.json : metrics and survival rows (json format)
+* <name>_survival_charts.json : Vega-Lite chart spec of the survival rate by each dimension
+and survival_reports.parquet holds the survival rows of all files, with their Dataset (parquet format).
+
+Usage:
+    python Titanic_Dataset_Reports_Creator_Batch.py [CSV files or directories ...] [--output-directory reports]
+                                                    [--format json --format parquet] [--workers 8] [--chunk-rows N]
+"""
+
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import altair as alt
+import pandas as pd
+
+
+## Import Helper Strings and Data Operations Functions
+from Titanic_Dataset_Reports_Creator_Data import (SURVIVAL_RATE,
+                                                  PASSENGER_COUNT,
+                                                  DIMENSION,
+                                                  CATEGORY,
+                                                  CUBE_DIMENSIONS,
+                                                  TITANIC_CSV_PATH,
+                                                  CSV_CHUNK_ROWS,
+                                                  cube_metrics,
+                                                  cube_survival_rate,
+                                                  stream_survival_cube,
+                                                  survival_report)
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+## Report formats
+JSON = "json"
+PARQUET = "parquet"
+
+REPORT_FORMATS = tuple((JSON, PARQUET))
+
+## Report column holding the dataset file of the row
+DATASET = "Dataset"
+
+## Output file names
+SURVIVAL_REPORT_SUFFIX = "_survival_report.json"
+SURVIVAL_CHARTS_SUFFIX = "_survival_charts.json"
+SURVIVAL_REPORTS_PARQUET = "survival_reports.parquet"
+
+## Dataset files in a directory
+DATASET_FILE_SUFFIX = ".csv"
+
+
+def dataset_paths(paths) -> list:
+    """
+    The given dataset files, with directories expanded to the CSV files they hold (sorted by name).
+    """
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths.extend(sorted(os.path.join(path, file_name) for file_name in os.listdir(path)
+                                     if file_name.endswith(DATASET_FILE_SUFFIX)))
+        else:
+            file_paths.append(path)
+    return file_paths
+
+
+def report_output_stems(paths, output_directory) -> dict:
+    """
+    Dataset file -> output path stem of its reports: its path relative to the common directory of all the files,
+    without the extension, under output_directory. Unique for each distinct file.
+    """
+    absolute_paths = {filepath: os.path.abspath(filepath) for filepath in paths}
+    common_directory = os.path.commonpath([os.path.dirname(absolute_path) for absolute_path in absolute_paths.values()])
+    return {filepath: os.path.join(output_directory, os.path.splitext(os.path.relpath(absolute_path, common_directory))[0])
+            for filepath, absolute_path in absolute_paths.items()}
+
+
+def survival_chart_specs(report: pd.DataFrame) -> dict:
+    ## Dimension -> Vega-Lite spec of the survival rate of its categories, the few report rows are the chart's data
+    chart_specs = {}
+    for dimension in CUBE_DIMENSIONS:
+        source = report[report[DIMENSION] == dimension][[CATEGORY, SURVIVAL_RATE, PASSENGER_COUNT]]
+        altair_chart = alt.Chart(source, title=f"{SURVIVAL_RATE} by {dimension}").mark_bar().encode(
+            x = alt.X(CATEGORY, title=dimension, sort=list(source[CATEGORY]), axis=alt.Axis(labelAngle=0)),
+            y = alt.Y(SURVIVAL_RATE, axis=alt.Axis(format='%')),
+            tooltip = [CATEGORY, alt.Tooltip(SURVIVAL_RATE, format='.2%'), PASSENGER_COUNT]
+        )
+        chart_specs[dimension] = altair_chart.to_dict()
+    return chart_specs
+
+
+## Process pool worker: only the file path and its output stem go in, and only the few survival report rows come back
+def write_dataset_report(filepath, output_stem, report_formats=REPORT_FORMATS, chunk_rows=CSV_CHUNK_ROWS) -> pd.DataFrame:
+    cube = stream_survival_cube(filepath, chunk_rows)
+    report = survival_report(cube)
+
+    os.makedirs(os.path.dirname(output_stem), exist_ok=True)
+    if JSON in report_formats:
+        metrics = {metric: value.to_dict() if isinstance(value, pd.Series) else float(value)
+                   for metric, value in cube_metrics(cube).items()}
+        with open(f"{output_stem}{SURVIVAL_REPORT_SUFFIX}", 'w') as file:
+            ## Rates of empty categories (NaN) are written as null, NaN is not valid JSON
+            survival_rows = report.astype(object).where(report.notna(), None).to_dict(orient='records')
+            json.dump({DATASET: filepath, "Metrics": metrics, "Survival": survival_rows}, file, indent=2)
+
+    with open(f"{output_stem}{SURVIVAL_CHARTS_SUFFIX}", 'w') as file:
+        json.dump(survival_chart_specs(report), file, indent=2)
+
+    logger.info(f"{filepath}: {cube_survival_rate(cube, {}, 'all passengers')}")
+    return report
+
+
+## Main function to report on many dataset files
+def batch_reports(paths, output_directory, report_formats=REPORT_FORMATS, workers=None, chunk_rows=CSV_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Write the reports of every dataset file, and return the survival rows of all of them with their DATASET.
+    Files that could not be read are logged and left out.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    report_dataset = partial(write_dataset_report, report_formats=report_formats, chunk_rows=chunk_rows)
+
+    ## A file given twice is reported once
+    paths = list(dict.fromkeys(paths))
+    output_stems = report_output_stems(paths, output_directory) if paths else {}
+
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as process_pool:
+        futures = {filepath: process_pool.submit(report_dataset, filepath, output_stems[filepath]) for filepath in paths}
+        for filepath, future in futures.items():
+            try:
+                reports.append(future.result().assign(**{DATASET: filepath}))
+            except Exception as e:
+                logger.error(f"Could not report on {filepath}: {e!r}")
+
+    logger.info(f"Reported on {len(reports)} of {len(paths)} dataset files")
+    if not reports:
+        return pd.DataFrame()
+
+    all_reports = pd.concat(reports, ignore_index=True)
+    all_reports = all_reports[[DATASET, *all_reports.columns.drop(DATASET)]]
+    if PARQUET in report_formats:
+        all_reports.to_parquet(os.path.join(output_directory, SURVIVAL_REPORTS_PARQUET), index=False)
+    return all_reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the Titanic survival reports of many dataset files, in parallel")
+    parser.add_argument('paths', nargs='*', help=f"Dataset CSV files, or directories of them (default: {TITANIC_CSV_PATH})")
+    parser.add_argument('--output-directory', default="reports", help="Directory the reports are written to")
+    parser.add_argument('--format', dest='report_formats', action='append', choices=REPORT_FORMATS,
+                        help=f"Report format, can be repeated (default: {', '.join(REPORT_FORMATS)})")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU core)")
+    parser.add_argument('--chunk-rows', type=int, default=CSV_CHUNK_ROWS, help="Rows read at once from a dataset file")
+    arguments = parser.parse_args()
+
+    paths = dataset_paths(arguments.paths or [TITANIC_CSV_PATH])
+    batch_reports(paths, arguments.output_directory, tuple(arguments.report_formats or REPORT_FORMATS),
+                  arguments.workers, arguments.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""
+Titanic Dataset data operations, shared by the Streamlit dashboard (Titanic_Dataset_Reports_Creator_Streamlit.py)
+and the batch report generator (Titanic_Dataset_Reports_Creator_Batch.py):
+loading, preprocessing, metrics, the survival cube, filter indexes and the columnar cache of the preprocessed frame.
+
+Streamlit is not imported here, so reports can be computed without it.
+"""
+
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+
+## List of frequently used strings
+
+### Dataframe Column Names
+PASSENGER_ID = "PassengerId"
+AGE = "Age"
+SEX = 'Sex'
+EMBARKED = "Embarked"
+SIBLINGS_SPOUSE_ABOARD = "Siblings/Spouses Aboard"
+PARENTS_CHILDREN_ABOARD = "Parents/Children Aboard"
+SURVIVED = "Survived"
+PASSENGER_CLASS = "Passenger Class"
+
+### Custom Columns
+FAMILY_SIZE = "FamilySize"
+AGE_BAND = "Age Band"
+
+### Integer columns, stored in the smallest integer type holding their values
+INTEGER_COLUMNS = tuple((PASSENGER_ID, SURVIVED, SIBLINGS_SPOUSE_ABOARD, PARENTS_CHILDREN_ABOARD))
+
+
+### Important Statistics Strings
+SURVIVAL_RATE = "Survival Rate"
+AVERAGE_AGE = "Average Age"
+PASSENGER_CLASS_COUNTS = "Passenger Class Counts"
+EMBARKING_PORT_COUNTS = "Embarking Port Counts"
+SEX_COUNTS = "Sex Counts"
+
+### Survival Cube Measures
+PASSENGER_COUNT = "Passenger Count"
+SURVIVOR_COUNT = "Survivor Count"
+AGE_SUM = "Age Sum"
+
+### Survival Report Columns
+DIMENSION = "Dimension"
+CATEGORY = "Category"
+## Dimension of the report rows of the dashboard's age groups spanning several age bands (e.g. Minors)
+AGE_GROUP = "Age Group"
+
+### Chart Data Columns and Values
+OUTCOME = "Outcome"
+SURVIVORS = "Survivors"
+NON_SURVIVORS = "Non-Survivors"
+
+
+### DataFrame Categorical Value Strings
+#### Port Names
+CHERBOURG = "Cherbourg"
+QUEENSTOWN = "Queenstown"
+SOUTHAMPTON = "Southampton"
+EMBARKING_PORT = "Embarking Port"
+
+#### Passenger Classes
+FIRST_CLASS = "1st Class"
+SECOND_CLASS = "2nd Class"
+THIRD_CLASS = "3rd Class"
+
+
+#### Sexes
+MALE = "male"
+FEMALE = "female"
+
+#### Age Bands, from lower (included) to upper (excluded) age bound
+INFANTS = "Infants (0-1 years)"
+TODDLERS = "Toddlers (1-3 years)"
+PRE_ADOLESCENTS = "Pre-Adolescents (3-13 years)"
+ADOLESCENTS = "Adolescents (13-18 years)"
+ADULTS = "Adults (18+ years)"
+
+AGE_BAND_EDGES = tuple((0, 1, 3, 13, 18, np.inf))
+
+#### Age Groups, made of one or more Age Bands
+MINORS = "Minors (<18 years)"
+
+
+### Helper Strings
+ALL = "All"
+
+MEMORY_USAGE = "Memory Usage"
+MATCHING_PASSENGERS = "Matching Passengers"
+
+
+## DataFrame Metrics and Values Lists
+
+### DataFrame Categorical Values Lists
+PORT_NAMES_LIST =  tuple((ALL, CHERBOURG, QUEENSTOWN, SOUTHAMPTON))
+PASSENGER_CLASSES_LIST =  tuple((ALL, FIRST_CLASS, SECOND_CLASS, THIRD_CLASS))
+AGE_BANDS_LIST = tuple((INFANTS, TODDLERS, PRE_ADOLESCENTS, ADOLESCENTS, ADULTS))
+
+### Age Bands of each Age Group
+AGE_GROUP_BANDS = {
+    **{age_band: tuple((age_band,)) for age_band in AGE_BANDS_LIST},
+    MINORS: tuple((INFANTS, TODDLERS, PRE_ADOLESCENTS, ADOLESCENTS)),
+}
+
+
+
+## Dataset file, next to this script
+TITANIC_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "titanic.csv")
+
+## Streaming ingestion: rows read per chunk, and the type each column is read as.
+## Sex and Embarked are read as strings, preprocess gives them their categories (in a fixed order).
+CSV_CHUNK_ROWS = 1_000_000
+TITANIC_CSV_DTYPES = {
+    PASSENGER_ID: 'int32',
+    SURVIVED: 'int8',
+    PASSENGER_CLASS: 'int8',
+    SEX: 'str',
+    AGE: 'float32',
+    SIBLINGS_SPOUSE_ABOARD: 'int16',
+    PARENTS_CHILDREN_ABOARD: 'int16',
+    EMBARKED: 'str',
+}
+### Columns read when only the aggregates are needed (no free text Name, Ticket, Cabin)
+AGGREGATE_COLUMNS = tuple(TITANIC_CSV_DTYPES)
+
+## Columnar cache of the preprocessed frame, next to the CSV and named after the CSV's content hash:
+## uncompressed Feather (Arrow IPC), so it can be memory-mapped when read
+COLUMNAR_CACHE_SUFFIX = ".feather"
+COLUMNAR_CACHE_HASH_LENGTH = 16
+RAW_MEMORY_MB_METADATA_KEY = b"untyped_memory_mb"
+
+
+
+## Data Operations Functions
+### DataSet loading function
+def load_titanic_data(filepath=TITANIC_CSV_PATH):
+    return pd.read_csv(filepath)
+
+
+
+### Preprocessing Functions
+
+#### Null filler functions, filling with the given value (of the whole file, when the series is a chunk) or the series' own
+def fillna_median(dataseries: pd.Series, median=None):
+    return dataseries.fillna(dataseries.median() if median is None else median)
+
+def fillna_mode(dataseries: pd.Series, mode=None):
+    return dataseries.fillna(dataseries.mode()[0] if mode is None else mode)
+
+
+#### Categorical column types: each value is stored once, rows hold small integer codes
+EMBARKED_DTYPE = pd.CategoricalDtype(PORT_NAMES_LIST[1:])
+PASSENGER_CLASS_DTYPE = pd.CategoricalDtype(PASSENGER_CLASSES_LIST[1:], ordered=True)
+SEX_DTYPE = pd.CategoricalDtype((MALE, FEMALE))
+AGE_BAND_DTYPE = pd.CategoricalDtype(AGE_BANDS_LIST, ordered=True)
+
+
+def preprocess(df: pd.DataFrame, age_median=None, embarked_mode=None) -> pd.DataFrame:
+    """
+    Fill missing values and convert the columns to compact types:
+    categorical Embarked, Passenger Class and Sex, float32 Age and the smallest integer type for integer columns.
+    Adds the FamilySize and the categorical Age Band columns.
+    Chunks of a file are filled with the file's age_median and embarked_mode (see scan_fill_values).
+    """
+    df[AGE] = fillna_median(df[AGE], age_median).astype('float32')
+    df[AGE_BAND] = pd.cut(df[AGE], bins=AGE_BAND_EDGES, right=False, labels=AGE_BANDS_LIST).astype(AGE_BAND_DTYPE)
+
+    ## Port codes and class numbers are converted to categories first, then only the few category labels are renamed
+    df[EMBARKED] = fillna_mode(df[EMBARKED], embarked_mode).astype(pd.CategoricalDtype(['C', 'Q', 'S']))
+    df[EMBARKED] = df[EMBARKED].cat.rename_categories({'C': CHERBOURG, 'Q': QUEENSTOWN, 'S': SOUTHAMPTON}).astype(EMBARKED_DTYPE)
+
+    df[SEX] = df[SEX].astype(SEX_DTYPE)
+
+    df[PASSENGER_CLASS] = df[PASSENGER_CLASS].astype(pd.CategoricalDtype([1, 2, 3]))
+    df[PASSENGER_CLASS] = df[PASSENGER_CLASS].cat.rename_categories({1: FIRST_CLASS, 2: SECOND_CLASS, 3: THIRD_CLASS}).astype(PASSENGER_CLASS_DTYPE)
+
+    df[FAMILY_SIZE] = df[SIBLINGS_SPOUSE_ABOARD] + df[PARENTS_CHILDREN_ABOARD] + 1
+
+    for integer_column in (*INTEGER_COLUMNS, FAMILY_SIZE):
+        df[integer_column] = pd.to_numeric(df[integer_column], downcast='integer')
+    
+    return df
+
+
+#### Memory usage report
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 2**20
+
+def memory_usage_report(raw_memory_mb: float, preprocessed_memory_mb: float) -> str:
+    return (f"{MEMORY_USAGE}: {raw_memory_mb:.2f} MB as loaded, {preprocessed_memory_mb:.2f} MB preprocessed "
+            f"({preprocessed_memory_mb / raw_memory_mb * 100:.0f}%)")
+
+
+### Metrics Generation Functions
+def generate_metrics(df:pd.DataFrame) -> dict:
+    avg_age = df[AGE].mean()
+    pclass_counts = df[PASSENGER_CLASS].value_counts()
+    embarking_port_counts = df[EMBARKED].value_counts()
+    sex_counts = df[SEX].value_counts()
+
+    return {
+        AVERAGE_AGE : avg_age,
+        PASSENGER_CLASS_COUNTS : pclass_counts,
+        EMBARKING_PORT_COUNTS : embarking_port_counts,
+        SEX_COUNTS : sex_counts
+    }
+
+def total_survival_rate(df: pd.DataFrame) -> str:
+    return f"Total {SURVIVAL_RATE} for all passengers: {df[SURVIVED].mean()*100:.2f}%"
+
+def filtered_survival_rate(filteredDataFrame: pd.DataFrame, filter_string) -> str:
+    return f"{SURVIVAL_RATE} for {filter_string}: {filteredDataFrame[SURVIVED].mean()*100:.2f}%"
+
+
+
+### Survival Cube
+## Passenger count, survivor count and age sum of every Sex x Embarked x Passenger Class x Age Band combination,
+## as a numpy array with one axis per dimension (positions follow the dimension's categories) and a last axis of measures.
+## Any combination of filters is answered from its few cells, whatever the number of passengers.
+CUBE_DIMENSIONS = {
+    SEX: SEX_DTYPE,
+    EMBARKED: EMBARKED_DTYPE,
+    PASSENGER_CLASS: PASSENGER_CLASS_DTYPE,
+    AGE_BAND: AGE_BAND_DTYPE,
+}
+CUBE_MEASURES = tuple((PASSENGER_COUNT, SURVIVOR_COUNT, AGE_SUM))
+
+
+def build_survival_cube(df: pd.DataFrame) -> np.ndarray:
+    ## One groupby over the categorical columns, observed=False keeps the empty combinations
+    cube = df.groupby(list(CUBE_DIMENSIONS), observed=False).agg(**{
+        PASSENGER_COUNT: (SURVIVED, 'size'),
+        SURVIVOR_COUNT: (SURVIVED, 'sum'),
+        AGE_SUM: (AGE, 'sum'),
+    })
+    shape = [len(dtype.categories) for dtype in CUBE_DIMENSIONS.values()]
+    return cube[list(CUBE_MEASURES)].to_numpy(dtype='float64').reshape(*shape, len(CUBE_MEASURES))
+
+def cube_totals(cube: np.ndarray, selections: dict) -> dict:
+    """
+    Measures summed over the selected cells. selections: dimension -> category, or list of categories.
+    Dimensions not selected, or selected as ALL, are summed over entirely.
+    Raises KeyError for a category that is not one of its dimension's categories.
+    """
+    selected_cells = cube
+    for axis, (dimension, dtype) in enumerate(CUBE_DIMENSIONS.items()):
+        categories = selections.get(dimension, ALL)
+        if isinstance(categories, str):
+            if categories == ALL:
+                continue
+            categories = [categories]
+        ## get_indexer gives -1 for unknown categories, which take would wrap around to the last category
+        category_positions = dtype.categories.get_indexer(categories)
+        if (category_positions == -1).any():
+            unknown_categories = [category for category, position in zip(categories, category_positions) if position == -1]
+            raise KeyError(f"Unknown {dimension} categories: {unknown_categories}")
+        selected_cells = selected_cells.take(category_positions, axis=axis)
+
+    return dict(zip(CUBE_MEASURES, selected_cells.reshape(-1, len(CUBE_MEASURES)).sum(axis=0)))
+
+def cube_totals_by(cube: np.ndarray, dimension: str) -> pd.DataFrame:
+    ## Measures of every category of dimension, summed over the other dimensions
+    axis = list(CUBE_DIMENSIONS).index(dimension)
+    other_axes = tuple(other_axis for other_axis in range(len(CUBE_DIMENSIONS)) if other_axis != axis)
+    return pd.DataFrame(cube.sum(axis=other_axes), index=CUBE_DIMENSIONS[dimension].categories, columns=CUBE_MEASURES)
+
+def cube_survival_rate(cube: np.ndarray, selections: dict, filter_string) -> str:
+    totals = cube_totals(cube, selections)
+    survival_rate = totals[SURVIVOR_COUNT] / totals[PASSENGER_COUNT] if totals[PASSENGER_COUNT] else float('nan')
+    return f"{SURVIVAL_RATE} for {filter_string}: {survival_rate*100:.2f}%"
+
+def cube_metrics(cube: np.ndarray) -> dict:
+    ## Same metrics as generate_metrics, from the cube
+    totals = cube_totals(cube, {})
+    return {
+        AVERAGE_AGE : totals[AGE_SUM] / totals[PASSENGER_COUNT],
+        PASSENGER_CLASS_COUNTS : cube_totals_by(cube, PASSENGER_CLASS)[PASSENGER_COUNT].astype('int64').sort_values(ascending=False),
+        EMBARKING_PORT_COUNTS : cube_totals_by(cube, EMBARKED)[PASSENGER_COUNT].astype('int64').sort_values(ascending=False),
+        SEX_COUNTS : cube_totals_by(cube, SEX)[PASSENGER_COUNT].astype('int64').sort_values(ascending=False)
+    }
+
+def survival_report(cube: np.ndarray) -> pd.DataFrame:
+    """
+    Passenger count, survivor count, survival rate and average age of all passengers (Dimension and Category ALL)
+    and of every category of every cube dimension, one row each. The dashboard's age groups of several age bands
+    (Minors) get a row each too (Dimension AGE_GROUP), so every group the dashboard shows is in the report.
+    """
+    dimension_totals = [pd.DataFrame([cube_totals(cube, {})], index=pd.MultiIndex.from_tuples([(ALL, ALL)]))]
+    for dimension in CUBE_DIMENSIONS:
+        totals = cube_totals_by(cube, dimension)
+        totals.index = pd.MultiIndex.from_product([[dimension], totals.index])
+        dimension_totals.append(totals)
+
+    age_groups = {age_group: age_bands for age_group, age_bands in AGE_GROUP_BANDS.items() if len(age_bands) > 1}
+    dimension_totals.append(pd.DataFrame([cube_totals(cube, {AGE_BAND: list(age_bands)}) for age_bands in age_groups.values()],
+                                         index=pd.MultiIndex.from_product([[AGE_GROUP], age_groups])))
+
+    report = pd.concat(dimension_totals).rename_axis([DIMENSION, CATEGORY])
+    ## Categories without passengers get no rate and no average (NaN)
+    passenger_counts = report[PASSENGER_COUNT].where(report[PASSENGER_COUNT] > 0)
+    report[SURVIVAL_RATE] = report[SURVIVOR_COUNT] / passenger_counts
+    report[AVERAGE_AGE] = report[AGE_SUM] / passenger_counts
+    report = report.astype({PASSENGER_COUNT: 'int64', SURVIVOR_COUNT: 'int64'})
+    return report.drop(columns=AGE_SUM).reset_index()
+
+
+
+### Chart Data
+## Charts only get the few aggregated rows they plot, never passenger rows, so their specs do not grow with the dataset
+def survivor_counts_chart_data(cube: np.ndarray, dimension: str) -> pd.DataFrame:
+    """
+    Survivor and non-survivor count of every category of dimension, in long form (dimension, OUTCOME, PASSENGER_COUNT):
+    two rows per category.
+    """
+    totals = cube_totals_by(cube, dimension)
+    chart_data = pd.DataFrame({
+        dimension: totals.index,
+        SURVIVORS: totals[SURVIVOR_COUNT].to_numpy(),
+        NON_SURVIVORS: (totals[PASSENGER_COUNT] - totals[SURVIVOR_COUNT]).to_numpy(),
+    })
+    chart_data = chart_data.melt(id_vars=dimension, var_name=OUTCOME, value_name=PASSENGER_COUNT)
+    return chart_data.astype({PASSENGER_COUNT: 'int64'})
+
+def survival_rate_chart_data(cube: np.ndarray, dimension: str) -> pd.DataFrame:
+    ## Survival rate (in %) and passenger count of every category of dimension
+    totals = cube_totals_by(cube, dimension)
+    return pd.DataFrame({
+        dimension: totals.index,
+        f"{SURVIVAL_RATE} (%)": (totals[SURVIVOR_COUNT] / totals[PASSENGER_COUNT].where(totals[PASSENGER_COUNT] > 0) * 100).to_numpy(),
+        PASSENGER_COUNT: totals[PASSENGER_COUNT].astype('int64').to_numpy(),
+    })
+
+
+
+### Streaming Ingestion
+## Files too large to parse at once are read in chunks of typed columns, in two passes.
+## The first pass only counts the values of Age and Embarked, giving the exact median and mode of the whole file
+## in memory bounded by the number of distinct values (when loading the frame, it also measures the first chunk
+## as read without dtypes, for the memory usage report). The second pass preprocesses each chunk with them.
+def read_titanic_chunks(filepath=TITANIC_CSV_PATH, chunksize=CSV_CHUNK_ROWS, usecols=None):
+    return pd.read_csv(filepath, dtype=TITANIC_CSV_DTYPES, usecols=usecols, chunksize=chunksize)
+
+def median_of_counts(value_counts: pd.Series) -> float:
+    ## Median of the values repeated by their counts, as Series.median computes it (mean of the two middle values)
+    value_counts = value_counts.sort_index()
+    cumulative_counts = value_counts.cumsum().to_numpy()
+    total_count = cumulative_counts[-1]
+    middle_values = value_counts.index[np.searchsorted(cumulative_counts, [(total_count - 1) // 2, total_count // 2], side='right')]
+    return float(middle_values.to_numpy(dtype='float64').mean())
+
+def scan_fill_values(filepath=TITANIC_CSV_PATH, chunksize=CSV_CHUNK_ROWS, untyped=False) -> tuple:
+    """
+    First pass: (Age median, Embarked mode, memory in MB of the first chunk as read) of the whole file.
+    Only Age and Embarked are read, typed. With untyped, all columns are read with the default dtypes instead,
+    the first chunk's memory is then that of the file's first rows as pd.read_csv loads them.
+    """
+    age_counts = pd.Series(dtype='int64')
+    embarked_counts = pd.Series(dtype='int64')
+    first_chunk_memory_mb = None
+    with (pd.read_csv(filepath, chunksize=chunksize) if untyped
+          else read_titanic_chunks(filepath, chunksize, usecols=[AGE, EMBARKED])) as chunks:
+        for chunk in chunks:
+            if first_chunk_memory_mb is None:
+                first_chunk_memory_mb = memory_usage_mb(chunk)
+            ## Counted as typed, the fill values do not depend on how the chunks were read
+            chunk = chunk[[AGE, EMBARKED]].astype({AGE: TITANIC_CSV_DTYPES[AGE], EMBARKED: TITANIC_CSV_DTYPES[EMBARKED]})
+            age_counts = age_counts.add(chunk[AGE].value_counts(), fill_value=0)
+            embarked_counts = embarked_counts.add(chunk[EMBARKED].value_counts(), fill_value=0)
+
+    ## Ties go to the smallest value, as with Series.mode
+    return median_of_counts(age_counts), embarked_counts.sort_index().idxmax(), first_chunk_memory_mb
+
+def read_preprocessed_titanic_data(filepath=TITANIC_CSV_PATH, chunksize=CSV_CHUNK_ROWS) -> tuple:
+    """
+    Preprocessed frame, built chunk by chunk, and the memory (in MB) the file takes as loaded without dtypes.
+    Peak memory is the compact typed frame plus one loaded chunk, instead of the whole loaded file.
+    """
+    ## The typed chunks take less memory than the file read with the default dtypes (object strings, float64...).
+    ## That figure is scaled from the first chunk, read untyped in the first pass and typed in the second,
+    ## exact when the file is a single chunk.
+    age_median, embarked_mode, untyped_first_chunk_mb = scan_fill_values(filepath, chunksize, untyped=True)
+
+    preprocessed_chunks = []
+    typed_memory_mb = 0.0
+    typed_first_chunk_mb = None
+    with read_titanic_chunks(filepath, chunksize) as chunks:
+        for chunk in chunks:
+            chunk_memory_mb = memory_usage_mb(chunk)
+            if typed_first_chunk_mb is None:
+                typed_first_chunk_mb = chunk_memory_mb
+            typed_memory_mb += chunk_memory_mb
+            preprocessed_chunks.append(preprocess(chunk, age_median, embarked_mode))
+
+    raw_memory_mb = typed_memory_mb * untyped_first_chunk_mb / typed_first_chunk_mb
+
+    return pd.concat(preprocessed_chunks, ignore_index=True), raw_memory_mb
+
+def stream_survival_cube(filepath=TITANIC_CSV_PATH, chunksize=CSV_CHUNK_ROWS) -> np.ndarray:
+    """
+    Survival cube of the file, summed chunk by chunk. Only the aggregates are kept, so peak memory
+    depends on the chunk size and not on the file size. cube_metrics gives the metrics of the file from it.
+    """
+    age_median, embarked_mode, _ = scan_fill_values(filepath, chunksize)
+
+    cube = None
+    for chunk in read_titanic_chunks(filepath, chunksize, usecols=AGGREGATE_COLUMNS):
+        chunk_cube = build_survival_cube(preprocess(chunk, age_median, embarked_mode))
+        cube = chunk_cube if cube is None else cube + chunk_cube
+    return cube
+
+
+
+### Filter Indexes
+## Boolean row index of every category of the filter dimensions, built once after preprocessing.
+## A combined filter ANDs the indexes of its dimensions (ORing the categories selected within one dimension),
+## an age range is looked up in the rows sorted by Age.
+FILTER_DIMENSIONS = tuple((SEX, EMBARKED, PASSENGER_CLASS, AGE_BAND))
+
+
+def build_filter_indexes(df: pd.DataFrame) -> dict:
+    """
+    dimension -> category -> boolean array over the rows, and AGE -> (sorted ages, row positions in age order).
+    """
+    filter_indexes = {}
+    for dimension in FILTER_DIMENSIONS:
+        codes = df[dimension].cat.codes.to_numpy()
+        filter_indexes[dimension] = {category: codes == position for position, category in enumerate(df[dimension].cat.categories)}
+
+    age_order = np.argsort(df[AGE].to_numpy(), kind='stable')
+    filter_indexes[AGE] = (df[AGE].to_numpy()[age_order], age_order)
+    return filter_indexes
+
+def filter_rows(filter_indexes: dict, selections: dict, age_range=None) -> np.ndarray:
+    """
+    Boolean array of the rows matching every selection. selections: dimension -> selected categories,
+    none selected means no filter on the dimension. age_range: (lowest, highest) age, both included.
+    """
+    sorted_ages, age_order = filter_indexes[AGE]
+    matching_rows = np.ones(len(age_order), dtype=bool)
+
+    for dimension, categories in selections.items():
+        if categories:
+            matching_rows &= np.logical_or.reduce([filter_indexes[dimension][category] for category in categories])
+
+    if age_range is not None:
+        first, last = np.searchsorted(sorted_ages, age_range[0], side='left'), np.searchsorted(sorted_ages, age_range[1], side='right')
+        age_rows = np.zeros(len(age_order), dtype=bool)
+        age_rows[age_order[first:last]] = True
+        matching_rows &= age_rows
+
+    return matching_rows
+
+def matching_survival_rate(df: pd.DataFrame, matching_rows: np.ndarray) -> str:
+    matching_count = np.count_nonzero(matching_rows)
+    survivor_count = np.count_nonzero(df[SURVIVED].to_numpy()[matching_rows])
+    survival_rate = survivor_count / matching_count if matching_count else float('nan')
+    return f"{MATCHING_PASSENGERS}: {matching_count}, {SURVIVAL_RATE}: {survival_rate*100:.2f}%"
+
+
+
+
+### Columnar Cache
+def file_hash(filepath, block_size=2**20) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def columnar_cache_path(filepath, csv_hash: str) -> str:
+    ## titanic.csv -> titanic.<hash prefix>.feather
+    return f"{os.path.splitext(filepath)[0]}.{csv_hash[:COLUMNAR_CACHE_HASH_LENGTH]}{COLUMNAR_CACHE_SUFFIX}"
+
+def write_columnar_cache(cache_path, df: pd.DataFrame, raw_memory_mb: float) -> None:
+    ## The CSV's memory as loaded without dtypes is kept in the file's metadata, for the memory usage report
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, RAW_MEMORY_MB_METADATA_KEY: str(raw_memory_mb).encode()})
+
+    ## Written to a temporary file first, a concurrent reader must never see a half written cache
+    temporary_path = f"{cache_path}.tmp"
+    feather.write_feather(table, temporary_path, compression='uncompressed')
+    os.replace(temporary_path, cache_path)
+
+def read_columnar_cache(cache_path) -> tuple:
+    table = feather.read_table(cache_path, memory_map=True)
+    return table.to_pandas(split_blocks=True), float(table.schema.metadata[RAW_MEMORY_MB_METADATA_KEY])
+
+def load_preprocessed_titanic_frame(filepath=TITANIC_CSV_PATH) -> tuple:
+    """
+    Preprocessed frame and the memory (in MB) the CSV takes as loaded without dtypes. Read from the columnar cache of the CSV's
+    current content if there is one, else read from the CSV and cached, replacing the caches of its previous contents.
+    """
+    cache_path = columnar_cache_path(filepath, file_hash(filepath))
+    if os.path.exists(cache_path):
+        try:
+            return read_columnar_cache(cache_path)
+        except KeyError:
+            ## Cache written without the memory figure it now keeps, rebuilt below
+            pass
+
+    df, raw_memory_mb = read_preprocessed_titanic_data(filepath)
+
+    stale_cache_pattern = f"{glob.escape(os.path.splitext(filepath)[0])}.{'[0-9a-f]' * COLUMNAR_CACHE_HASH_LENGTH}{COLUMNAR_CACHE_SUFFIX}"
+    try:
+        for stale_cache_path in glob.glob(stale_cache_pattern):
+            os.remove(stale_cache_path)
+        write_columnar_cache(cache_path, df, raw_memory_mb)
+    except OSError:
+        ## Not cached (e.g. read-only directory), the next start reads the CSV again
+        pass
+
+    return df, raw_memory_mb
@@ -20,54 +20,59 @@ in his post: https://databytesandinsights.substack.com/p/day-50-of-50-days-of-py
 """
 
 
+import os
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
 
-## List of frequently used strings
-
-### Dataframe Column Names
-AGE = "Age"
-SEX = 'Sex'
-EMBARKED = "Embarked"
-SIBLINGS_SPOUSE_ABOARD = "Siblings/Spouses Aboard"
-PARENTS_CHILDREN_ABOARD = "Parents/Children Aboard"
-SURVIVED = "Survived"
-PASSENGER_CLASS = "Passenger Class"
-
-### Custom Columns
-FAMILY_SIZE = "FamilySize"
-
-
-### Important Statistics Strings
-SURVIVAL_RATE = "Survival Rate"
-AVERAGE_AGE = "Average Age"
-PASSENGER_CLASS_COUNTS = "Passenger Class Counts"
-EMBARKING_PORT_COUNTS = "Embarking Port Counts"
-SEX_COUNTS = "Sex Counts"
 
+## Import Helper Strings and Data Operations Functions
+from Titanic_Dataset_Reports_Creator_Data import (AGE,
+                                                  SEX,
+                                                  EMBARKED,
+                                                  PASSENGER_CLASS,
+                                                  AGE_BAND,
+                                                  SURVIVAL_RATE,
+                                                  AVERAGE_AGE,
+                                                  PASSENGER_COUNT,
+                                                  EMBARKING_PORT,
+                                                  MALE,
+                                                  FEMALE,
+                                                  INFANTS,
+                                                  TODDLERS,
+                                                  PRE_ADOLESCENTS,
+                                                  ADOLESCENTS,
+                                                  ADULTS,
+                                                  MINORS,
+                                                  ALL,
+                                                  PORT_NAMES_LIST,
+                                                  PASSENGER_CLASSES_LIST,
+                                                  AGE_GROUP_BANDS,
+                                                  TITANIC_CSV_PATH,
+                                                  memory_usage_mb,
+                                                  memory_usage_report,
+                                                  generate_metrics,
+                                                  CUBE_DIMENSIONS,
+                                                  build_survival_cube,
+                                                  cube_survival_rate,
+                                                  FILTER_DIMENSIONS,
+                                                  build_filter_indexes,
+                                                  filter_rows,
+                                                  matching_survival_rate,
+                                                  OUTCOME,
+                                                  SURVIVORS,
+                                                  NON_SURVIVORS,
+                                                  survivor_counts_chart_data,
+                                                  survival_rate_chart_data,
+                                                  load_preprocessed_titanic_frame)
 
-### DataFrame Categorical Value Strings
-#### Port Names
-CHERBOURG = "Cherbourg"
-QUEENSTOWN = "Queenstown"
-SOUTHAMPTON = "Southampton"
-EMBARKING_PORT = "Embarking Port"
-
-#### Passenger Classes
-FIRST_CLASS = "1st Class"
-SECOND_CLASS = "2nd Class"
-THIRD_CLASS = "3rd Class"
-
-
-#### Sexes
-MALE = "male"
-FEMALE = "female"
 
+## List of frequently used strings
 
 ### Helper Strings
 FILTER_BY = "Filter By"
-ALL = "All"
 SELECT = "Select"
 
 MALES = "Males"
@@ -78,84 +83,163 @@ SEX_SELECTION = "Sex (Male/Female)"
 
 SURVIVOR_COUNT_BY = "Survivor Count by"
 
-## DataFrame Metrics and Values Lists
+COMBINED_FILTERS = "Combined Filters"
+ROWS = "Rows"
 
-### DataFrame Metrics List
-METRICS_LIST = tuple((AGE, SEX, EMBARKED, PASSENGER_CLASS))
+COLUMNS = "Columns"
+SORT_BY = "Sort by"
+UNSORTED = "(unsorted)"
+DESCENDING = "Descending"
+ROWS_PER_PAGE = "Rows per page"
+PAGE = "Page"
+RELOAD_DATASET = "Reload dataset"
 
-### DataFrame Categorical Values Lists
-PORT_NAMES_LIST =  tuple((ALL, CHERBOURG, QUEENSTOWN, SOUTHAMPTON))
-PASSENGER_CLASSES_LIST =  tuple((ALL, FIRST_CLASS, SECOND_CLASS, THIRD_CLASS))
+## DataFrame Values Lists
+METRICS_LIST = tuple((AGE, SEX, EMBARKED, PASSENGER_CLASS))
 SEXES_LIST =  tuple((ALL, MALES, FEMALES))
-
-
-
-## Data Operations Functions
-### DataSet loading function
-def load_titanic_data(filepath=r'TinyProjects\Data Reporters\Titanic Dataset Reports Creator\titanic.csv'):
-    return pd.read_csv(filepath)
-
-
-
-### Preprocessing Functions
-
-#### Null filler functions
-def fillna_median(dataseries: pd.Series):
-    return dataseries.fillna(dataseries.median())
-
-def fillna_mode(dataseries: pd.Series):
-    return dataseries.fillna(dataseries.mode()[0])
-
-
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
-    df[AGE] = fillna_median(df[AGE])
-
-    df[EMBARKED] = fillna_mode(df[EMBARKED])
-    df[EMBARKED] = df[EMBARKED].map({'S': SOUTHAMPTON, 'C': CHERBOURG, 'Q': QUEENSTOWN})
-    
-    # df[SEX] = df[SEX].map({MALE: 0, FEMALE: 1})
-    
-    df[PASSENGER_CLASS] = df[PASSENGER_CLASS].map({1: FIRST_CLASS, 2: SECOND_CLASS, 3: THIRD_CLASS})
-
-    df[FAMILY_SIZE] = df[SIBLINGS_SPOUSE_ABOARD] + df[PARENTS_CHILDREN_ABOARD] + 1
-    
-    return df
-
-
-### Metrics Generation Functions
-def generate_metrics(df:pd.DataFrame) -> dict:
-    avg_age = df[AGE].mean()
-    pclass_counts = df[PASSENGER_CLASS].value_counts()
-    embarking_port_counts = df[EMBARKED].value_counts()
-    sex_counts = df[SEX].value_counts()
-
-    return {
-        AVERAGE_AGE : avg_age,
-        PASSENGER_CLASS_COUNTS : pclass_counts,
-        EMBARKING_PORT_COUNTS : embarking_port_counts,
-        SEX_COUNTS : sex_counts
-    }
-
-def total_survival_rate(df: pd.DataFrame) -> str:
-    return f"Total {SURVIVAL_RATE} for all passengers: {df[SURVIVED].mean()*100:.2f}%"
-
-def filtered_survival_rate(filteredDataFrame: pd.DataFrame, filter_string) -> str:
-    return f"{SURVIVAL_RATE} for {filter_string}: {filteredDataFrame[SURVIVED].mean()*100:.2f}%"
+PAGE_SIZES_LIST = tuple((25, 50, 100, 500))
+AGE_GROUPS_LIST = tuple((ALL, ADULTS, MINORS, INFANTS, TODDLERS, PRE_ADOLESCENTS, ADOLESCENTS))
+
+
+
+### Table Pages
+## Tables are shown one page at a time: only the rows of the page are sent to the browser.
+## Sorting is done here, with the row order of every sorted column computed once.
+def build_sort_order(df: pd.DataFrame, column: str) -> np.ndarray:
+    ## Row positions in column order (categories in category order, missing values last)
+    return df[column].reset_index(drop=True).sort_values(kind='stable').index.to_numpy()
+
+def page_positions(sort_order: np.ndarray, matching_rows=None, descending=False, page=1, page_size=PAGE_SIZES_LIST[0]) -> tuple:
+    """
+    (Row positions of the page, number of matching rows). sort_order: row positions in display order,
+    matching_rows: boolean array of the rows to show, None for all. Pages are numbered from 1.
+    """
+    positions = sort_order if matching_rows is None else sort_order[matching_rows[sort_order]]
+    if descending:
+        positions = positions[::-1]
+    first = (page - 1) * page_size
+    return positions[first:first + page_size], len(positions)
+
+
+
+### Caching
+## Only the entries of the current file signature are kept: one per cached function, and one per column or
+## cube dimension for the sort orders and charts. Entries of a replaced file are evicted instead of piling up.
+SORT_ORDERS_CACHE_ENTRIES = 16
+
+def file_signature(filepath) -> tuple:
+    ## Changes whenever the file is rewritten, without reading it
+    file_stat = os.stat(filepath)
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+@st.cache_resource(show_spinner="Loading the Titanic dataset...", max_entries=1)
+def load_preprocessed_titanic_data(filepath, signature) -> tuple:
+    """
+    Preprocessed frame, its memory usage (as loaded, preprocessed) in MB and its (lowest, highest) age,
+    cached per file path and signature.
+    The one frame is shared by all sessions and reruns, so it must never be modified in place.
+    """
+    df, raw_memory_mb = load_preprocessed_titanic_frame(filepath)
+    return df, raw_memory_mb, memory_usage_mb(df), (float(df[AGE].min()), float(df[AGE].max()))
+
+@st.cache_data(max_entries=1)
+def cached_metrics(filepath, signature, _df: pd.DataFrame) -> dict:
+    ## The frame is identified by filepath and signature, it is not hashed
+    return generate_metrics(_df)
+
+@st.cache_resource(max_entries=1)
+def cached_filter_indexes(filepath, signature, _df: pd.DataFrame) -> dict:
+    return build_filter_indexes(_df)
+
+@st.cache_resource(max_entries=1)
+def cached_survival_cube(filepath, signature, _df: pd.DataFrame) -> np.ndarray:
+    cube = build_survival_cube(_df)
+    ## Shared by all sessions
+    cube.flags.writeable = False
+    return cube
+
+@st.cache_resource(max_entries=SORT_ORDERS_CACHE_ENTRIES)
+def cached_sort_order(filepath, signature, column, _df: pd.DataFrame) -> np.ndarray:
+    sort_order = build_sort_order(_df, column)
+    sort_order.flags.writeable = False
+    return sort_order
+
+### Charts, built once per metric from the cube
+@st.cache_resource(max_entries=len(CUBE_DIMENSIONS))
+def cached_survivor_counts_chart(filepath, signature, dimension, dimension_label, _cube: np.ndarray) -> alt.Chart:
+    ## Survivors and non-survivors of every category, stacked
+    chart_data = survivor_counts_chart_data(_cube, dimension)
+    return alt.Chart(chart_data, title=f"{SURVIVOR_COUNT_BY} {dimension_label}").mark_bar().encode(
+        x = alt.X(dimension, title=dimension_label, sort=list(CUBE_DIMENSIONS[dimension].categories), axis=alt.Axis(labelAngle=0)),
+        y = PASSENGER_COUNT,
+        color = alt.Color(OUTCOME, sort=[SURVIVORS, NON_SURVIVORS]),
+        order = alt.Order(f"{OUTCOME}:N", sort='descending'),
+        tooltip = [dimension, OUTCOME, PASSENGER_COUNT]
+    )
+
+@st.cache_resource(max_entries=len(CUBE_DIMENSIONS))
+def cached_survival_rate_chart(filepath, signature, dimension, _cube: np.ndarray) -> alt.Chart:
+    chart_data = survival_rate_chart_data(_cube, dimension)
+    return alt.Chart(chart_data).mark_bar().encode(
+        x = alt.X(dimension, sort=list(CUBE_DIMENSIONS[dimension].categories), axis=alt.Axis(labelAngle=0)),
+        y = f"{SURVIVAL_RATE} (%)",
+        tooltip = [dimension, f"{SURVIVAL_RATE} (%)", PASSENGER_COUNT]
+    )
+
+def clear_caches() -> None:
+    load_preprocessed_titanic_data.clear()
+    cached_metrics.clear()
+    cached_survival_cube.clear()
+    cached_filter_indexes.clear()
+    cached_sort_order.clear()
+    cached_survivor_counts_chart.clear()
+    cached_survival_rate_chart.clear()
+
+
+def paginated_table(df: pd.DataFrame, signature, matching_rows=None, key=""):
+    """
+    Page of the matching rows (all rows if None), with column, sort and page controls and a row count summary.
+    key tells apart the controls of the tables of the page.
+    """
+    columns_control, sort_control, page_size_control, page_control = st.columns(4)
+    columns = columns_control.multiselect(COLUMNS, list(df.columns), default=list(df.columns), key=f"{key} {COLUMNS}")
+    sort_column = sort_control.selectbox(SORT_BY, (UNSORTED, *df.columns), key=f"{key} {SORT_BY}")
+    descending = sort_control.checkbox(DESCENDING, key=f"{key} {DESCENDING}")
+    page_size = page_size_control.selectbox(ROWS_PER_PAGE, PAGE_SIZES_LIST, key=f"{key} {ROWS_PER_PAGE}")
+    page = page_control.number_input(PAGE, min_value=1, step=1, key=f"{key} {PAGE}")
+
+    sort_order = np.arange(len(df)) if sort_column == UNSORTED else cached_sort_order(TITANIC_CSV_PATH, signature, sort_column, df)
+    row_count = len(df) if matching_rows is None else np.count_nonzero(matching_rows)
+    page_count = max(1, -(-row_count // page_size))
+    ## The page number is kept when the filters change, it may be past the last page of the new rows
+    page = min(page, page_count)
+
+    positions, row_count = page_positions(sort_order, matching_rows, descending, page, page_size)
+    st.dataframe(df.iloc[positions][columns or list(df.columns)])
+    st.caption(f"{ROWS} {(page - 1) * page_size + min(1, len(positions))}-{(page - 1) * page_size + len(positions)} "
+               f"of {row_count} ({PAGE} {page} of {page_count})")
 
 
 
 def main():
     st.title("Titanic Data Dashboard")
-    df = load_titanic_data(r'TinyProjects\Data Reporters\Titanic Dataset Reports Creator\titanic.csv')
-    df = preprocess(df)
+
+    if st.sidebar.button(RELOAD_DATASET):
+        clear_caches()
+
+    signature = file_signature(TITANIC_CSV_PATH)
+    df, raw_memory_mb, preprocessed_memory_mb, (lowest_age, highest_age) = load_preprocessed_titanic_data(TITANIC_CSV_PATH, signature)
 
     st.header("Dataset Overview")
     st.write(df.head())
-
-    totalSurvivalRate = total_survival_rate(df)
+    st.caption(memory_usage_report(raw_memory_mb, preprocessed_memory_mb))
 
     st.header("Survival Metrics")
-    metrics = generate_metrics(df)
+    metrics = cached_metrics(TITANIC_CSV_PATH, signature, df)
+    cube = cached_survival_cube(TITANIC_CSV_PATH, signature, df)
+    filter_indexes = cached_filter_indexes(TITANIC_CSV_PATH, signature, df)
+    ## Reruns answer from the cached aggregates, never scanning the whole frame
+    totalSurvivalRate = f"Total {cube_survival_rate(cube, {}, 'all passengers')}"
     st.write(totalSurvivalRate)
     st.write(f"{AVERAGE_AGE}: {metrics[AVERAGE_AGE]:.2f}")
 
@@ -171,23 +255,12 @@ def main():
         sex_filter = st.radio(f"{SELECT} {SEX}:", SEXES_LIST)
         if sex_filter != ALL:
             sex_val = MALE if sex_filter == MALES else FEMALE
-            filtered_df = df[df[SEX] == sex_val]
-            st.write(filtered_df)
-            st.write(filtered_survival_rate(filtered_df, sex_filter))
+            paginated_table(df, signature, filter_rows(filter_indexes, {SEX: [sex_val]}), key=SEX)
+            st.write(cube_survival_rate(cube, {SEX: sex_val}, sex_filter))
         else:
-            st.write(df)
+            paginated_table(df, signature, key=SEX)
            
-        source = pd.DataFrame({
-                SEXES : metrics[SEX_COUNTS].index,
-                f"{SURVIVOR_COUNT_BY} {SEX_SELECTION}" : metrics[SEX_COUNTS]
-            }
-        )
-        altair_chart = alt.Chart(source).mark_bar().encode(
-            x = alt.X(SEXES, axis=alt.Axis(labelAngle=0)),
-            y = f"{SURVIVOR_COUNT_BY} {SEX_SELECTION}"
-
-        )
-        st.altair_chart(altair_chart)
+        st.altair_chart(cached_survivor_counts_chart(TITANIC_CSV_PATH, signature, SEX, SEX_SELECTION, cube))
     
 
     elif (metrics_selection == EMBARKED):
@@ -198,23 +271,13 @@ def main():
         embarked_filter = st.radio(f"{SELECT} {EMBARKING_PORT}:", PORT_NAMES_LIST)
 
         if embarked_filter != ALL:
-            filtered_df = df[df[EMBARKED] == embarked_filter]
-            st.write(filtered_df)
-            st.write(filtered_survival_rate(filtered_df, f"Passengers Embarking at {embarked_filter}"))
+            paginated_table(df, signature, filter_rows(filter_indexes, {EMBARKED: [embarked_filter]}), key=EMBARKED)
+            st.write(cube_survival_rate(cube, {EMBARKED: embarked_filter}, f"Passengers Embarking at {embarked_filter}"))
 
         else:
-            st.write(df)
-
-        source = pd.DataFrame({
-                f"{EMBARKING_PORT}" : metrics[EMBARKING_PORT_COUNTS].index,
-                f"{SURVIVOR_COUNT_BY} {EMBARKING_PORT}" : metrics[EMBARKING_PORT_COUNTS]
-            }
-        )
-        altair_chart = alt.Chart(source).mark_bar().encode(
-            x = alt.X(f"{EMBARKING_PORT}", axis=alt.Axis(labelAngle=0)),
-            y = f"{SURVIVOR_COUNT_BY} {EMBARKING_PORT}"
-        )
-        st.altair_chart(altair_chart)
+            paginated_table(df, signature, key=EMBARKED)
+
+        st.altair_chart(cached_survivor_counts_chart(TITANIC_CSV_PATH, signature, EMBARKED, EMBARKING_PORT, cube))
         
 
     elif (metrics_selection == PASSENGER_CLASS):
@@ -224,25 +287,15 @@ def main():
         passenger_class_filter = st.radio(f"{SELECT} {PASSENGER_CLASS}:", PASSENGER_CLASSES_LIST)
         
         if (passenger_class_filter != ALL):
-            filtered_df = df[df[PASSENGER_CLASS] == passenger_class_filter]
-            st.write(filtered_df)
-            st.write(filtered_survival_rate(filtered_df, passenger_class_filter))
+            paginated_table(df, signature, filter_rows(filter_indexes, {PASSENGER_CLASS: [passenger_class_filter]}), key=PASSENGER_CLASS)
+            st.write(cube_survival_rate(cube, {PASSENGER_CLASS: passenger_class_filter}, passenger_class_filter))
         else:
-            st.write(df)
+            paginated_table(df, signature, key=PASSENGER_CLASS)
 
         # st.bar_chart(metrics[PASSENGER_CLASS_COUNTS], x=None, y=None, 
         #              x_label="Passenger Classes", y_label="Survival Count by Passenger Class", 
         #              color=None, horizontal=False, stack=None, width=None, height=None, use_container_width=True)
-        source = pd.DataFrame({
-                PASSENGER_CLASS : metrics[PASSENGER_CLASS_COUNTS].index,
-                f"{SURVIVOR_COUNT_BY} {PASSENGER_CLASS}" : metrics[PASSENGER_CLASS_COUNTS]
-            }
-        )
-        altair_chart = alt.Chart(source).mark_bar().encode(
-            x = alt.X(PASSENGER_CLASS, axis=alt.Axis(labelAngle=0)),
-            y = f"{SURVIVOR_COUNT_BY} {PASSENGER_CLASS}"
-        )
-        st.altair_chart(altair_chart)
+        st.altair_chart(cached_survivor_counts_chart(TITANIC_CSV_PATH, signature, PASSENGER_CLASS, PASSENGER_CLASS, cube))
     
     
     elif (metrics_selection == AGE):
@@ -250,47 +303,35 @@ def main():
         Show statistics based on Passenger Age metric
         """
 
-        ages_list = tuple((ALL, "Adults (>18 years)", "Minors (<18 years)", "Infants (0-1 years)", "Toddlers (1-3 years)", "Pre-Adolescents (3-13 years)", "Adolescents (13-18 years)"))
-
-        age_filter = st.radio(f"{SELECT} {AGE}:", ages_list)
+        age_filter = st.radio(f"{SELECT} {AGE}:", AGE_GROUPS_LIST)
         
         if (age_filter != ALL):
-            filtered_df = pd.Series()
-            if (age_filter == ages_list[1]):
-                filtered_df = df[df[AGE] > 18]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            elif (age_filter == ages_list[2]):
-                filtered_df = df[df[AGE] < 18]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            elif (age_filter == ages_list[3]):
-                filtered_df = df[df[AGE].isin([0, 1])]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            elif (age_filter == ages_list[4]):
-                filtered_df = df[df[AGE].isin([1, 3])]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            elif (age_filter == ages_list[5]):
-                filtered_df = df[df[AGE].isin([3, 13])]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            elif (age_filter == ages_list[6]):
-                filtered_df = df[df[AGE].isin([13, 18])]
-                st.write(filtered_df)
-                st.write(filtered_survival_rate(filtered_df, age_filter))
-            
+            age_bands = list(AGE_GROUP_BANDS[age_filter])
+            paginated_table(df, signature, filter_rows(filter_indexes, {AGE_BAND: age_bands}), key=AGE)
+            st.write(cube_survival_rate(cube, {AGE_BAND: age_bands}, age_filter))
         else:
-            st.write(df)
-        
+            paginated_table(df, signature, key=AGE)
+
+        st.altair_chart(cached_survival_rate_chart(TITANIC_CSV_PATH, signature, AGE_BAND, cube))
+
+
+    st.header(COMBINED_FILTERS)
+    ## Nothing selected in a dimension means all of its values
+    selections = {
+        dimension: st.multiselect(f"{SELECT} {dimension}:", CUBE_DIMENSIONS[dimension].categories, placeholder=ALL)
+        for dimension in FILTER_DIMENSIONS
+    }
+    age_range = st.slider(f"{SELECT} {AGE}:", lowest_age, highest_age, (lowest_age, highest_age))
+
+    matching_rows = filter_rows(filter_indexes, selections, None if age_range == (lowest_age, highest_age) else age_range)
+    st.write(matching_survival_rate(df, matching_rows))
+    paginated_table(df, signature, matching_rows, key=COMBINED_FILTERS)
     
     
 
 
 if __name__ == "__main__":
     main()
-    # df = load_titanic_data(filepath=r'TinyProjects\Data Reporters\Titanic Dataset Reports Creator\titanic.csv')
-    # df = preprocess(df)
+    # df, raw_memory_mb = load_preprocessed_titanic_frame()
     # metrics = generate_metrics(df)
     # print(metrics)
\ No newline at end of file
@@ -1,21 +1,24 @@
-import requests
-from bs4 import BeautifulSoup
-
 import pandas as pd
 
 import logging
 
 
 ## Import Helper Strings and Helper Functions
-from GenAI_Model_Details_Constants import (AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+from GenAI_Model_Details_Constants import (AWS_BEDROCK,
+                                           AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+                                           PROVIDER_FETCH_TIMEOUT_SECONDS,
+                                           SCRAPER_OUTPUT_FORMATS,
                                            MODEL_NAME,
                                            MODEL_RETIREMENT_DATE,
                                            MODEL_VERSION,
                                            MODEL_PROVIDER_NAME,
                                            RECOMMENDED_REPLACEMENT_MODEL,
-                                           NO_SOONER_THAT)
+                                           MODEL_RETIREMENT_WINDOW_DAYS)
 
-from GenAI_Model_Details_Assistant_Functions import column_text_extracter
+from GenAI_Model_Details_Table_Index import build_table_index, find_tables_by_headers
+from GenAI_Model_Details_Page_Cache import PageCache
+from GenAI_Model_Details_Provider_Registry import (LifecycleProvider, ModelsTable, register_provider,
+                                                   update_provider_lifecycle_information)
 
 
 # Configure logging
@@ -24,121 +27,122 @@ logger = logging.getLogger(__name__)
 
 
 ## AWS model specific functions
-def get_aws_active_models(soup: BeautifulSoup):
-    ## Table ID: w471aac15c34c11c11
-    return soup.find_all(id = 'w471aac15c34c11c11')
-
-def get_aws_legacy_models(soup: BeautifulSoup):
-    ## Table ID: w471aac15c34c13c11
-    return soup.find_all(id = 'w471aac15c34c13c11')
+### Header cells identifying the Active and Legacy models tables. Their element ids change whenever AWS regenerates the docs.
+AWS_ACTIVE_MODELS_TABLE_HEADERS = ("Provider", "Model name", "Model ID", "Tentative EOL")
+AWS_LEGACY_MODELS_TABLE_HEADERS = ("Model version", "EOL date", "Recommended model ID")
+
+### Names of the located tables
+AWS_ACTIVE_MODELS_TABLE = "Active Models"
+AWS_LEGACY_MODELS_TABLE = "Legacy Models"
+
+### Names of the saved tables (Excel sheet names) and their output file name stem
+AWS_ACTIVE_MODELS_OUTPUT_TABLE = 'Active Models Retirement Details'
+AWS_LEGACY_MODELS_OUTPUT_TABLE = 'Legacy Models Retirement Details'
+AWS_OUTPUT_FILE_STEM = 'aws_bedrock_models_lifecycle'
+AWS_CHANGES_FILE = 'aws_bedrock_models_lifecycle_changes.csv'
+
+### Retirement date column of the Active models table
+TENTATIVE_MODEL_RETIREMENT_DATE = f"Tentative {MODEL_RETIREMENT_DATE}"
+
+### Columns identifying a model in each table: Model ID for active models, model version for legacy models
+AWS_ACTIVE_MODELS_KEY_COLUMNS = [MODEL_VERSION]
+AWS_LEGACY_MODELS_KEY_COLUMNS = [MODEL_NAME]
+
+
+"""
+Active Models Table Columns
+    <th>Provider</th> --> 0
+    <th>Model name</th> --> 1
+    <th>Model ID</th> --> 2
+    <th>Regions supported</th>
+    <th>Launch date</th>
+    <th>Tentative EOL</th> --> 5
+    <th>Input modalities</th>
+    <th>Output modalities</th>
+
+AWS Bedrock active models have only tentative EOL. Hence, checks for whether a retires in next 90 days are invalid.
+"""
+AWS_ACTIVE_MODELS = ModelsTable(AWS_ACTIVE_MODELS_TABLE, AWS_ACTIVE_MODELS_TABLE_HEADERS,
+                                columns={MODEL_PROVIDER_NAME: 0, MODEL_NAME: 1, MODEL_VERSION: 2, TENTATIVE_MODEL_RETIREMENT_DATE: 5},
+                                retirement_date_column=TENTATIVE_MODEL_RETIREMENT_DATE,
+                                key_columns=AWS_ACTIVE_MODELS_KEY_COLUMNS,
+                                output_table=AWS_ACTIVE_MODELS_OUTPUT_TABLE,
+                                all_tentative=True)
+
+"""
+Legacy Models Table Columns
+    <th>Model version</th> --> 0
+    <th>Legacy date</th>
+    <th>Public extended access date</th>
+    <th>EOL date</th> --> 3
+    <th>Recommended model version replacement</th> --> 4
+    <th>Recommended model ID</th> --> 5
+"""
+AWS_LEGACY_MODELS = ModelsTable(AWS_LEGACY_MODELS_TABLE, AWS_LEGACY_MODELS_TABLE_HEADERS,
+                                columns={MODEL_NAME: 0, RECOMMENDED_REPLACEMENT_MODEL: (4, 5), MODEL_RETIREMENT_DATE: 3},
+                                retirement_date_column=MODEL_RETIREMENT_DATE,
+                                key_columns=AWS_LEGACY_MODELS_KEY_COLUMNS,
+                                output_table=AWS_LEGACY_MODELS_OUTPUT_TABLE)
+
+AWS_BEDROCK_PROVIDER = register_provider(LifecycleProvider(AWS_BEDROCK, AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+                                                           (AWS_ACTIVE_MODELS, AWS_LEGACY_MODELS),
+                                                           output_file_stem=AWS_OUTPUT_FILE_STEM,
+                                                           changes_file=AWS_CHANGES_FILE,
+                                                           fetch_timeout=PROVIDER_FETCH_TIMEOUT_SECONDS[AWS_BEDROCK]))
+
+
+def get_aws_active_models(soup):
+    return find_tables_by_headers(build_table_index(soup), AWS_ACTIVE_MODELS_TABLE_HEADERS)
+
+def get_aws_legacy_models(soup):
+    return find_tables_by_headers(build_table_index(soup), AWS_LEGACY_MODELS_TABLE_HEADERS)
 
 
 def get_aws_active_models_data(aws_active_models_table) -> pd.DataFrame:
-    """
-    Active Models Table Columns
-        <th>Provider</th> --> 0
-        <th>Model name</th> --> 1
-        <th>Model ID</th> --> 2
-        <th>Regions supported</th>
-        <th>Launch date</th>
-        <th>Tentative EOL</th> --> 5
-        <th>Input modalities</th>
-        <th>Output modalities</th>
-    """
-
-    """ 
-    AWS Bedrock active models have only tentative EOL. Hence, checks for whether a retires in next 90 days are invalid.
-    """
-
-
-    model_data = []
-
-    ## Helper Strings
-    TENTATIVE_MODEL_RETIREMENT_DATE = f"Tentative {MODEL_RETIREMENT_DATE}"
-
-    for table in aws_active_models_table:
-        rows = table.find_all('tr')
-        # print(rows[0])
-        
-        for row in rows[1:]:  # Skip the header row
-            columns = row.find_all('td')
-
-            if len(columns) >= 5:  # Ensure there are enough columns
-                model_provider_name = column_text_extracter(columns[0])
-                model_name = column_text_extracter(columns[1]) 
-                model_version = column_text_extracter(columns[2]) 
-                retirement_date = column_text_extracter(columns[5]) 
-                
-                model_data.append({
-                    MODEL_PROVIDER_NAME : model_provider_name,
-                    MODEL_NAME: model_name,
-                    MODEL_VERSION: model_version,
-                    TENTATIVE_MODEL_RETIREMENT_DATE: retirement_date
-                })
-
-    # Create a DataFrame from the model data
-    return pd.DataFrame(model_data)
+    return AWS_ACTIVE_MODELS.rows_dataframe(aws_active_models_table)
 
 
 def get_aws_legacy_models_data(aws_legacy_models_table) -> pd.DataFrame:
-    """
-    Legacy Models Table Columns
-        <th>Model version</th> --> 0
-        <th>Legacy date</th>
-        <th>Public extended access date</th>
-        <th>EOL date</th> --> 1
-        <th>Recommended model version replacement</th> --> 2
-        <th>Recommended model ID</th> --> 3
-    """
-
-    model_data = []
-
-    for table in aws_legacy_models_table:
-        rows = table.find_all('tr')
-        # print(rows[0])
-        
-        for row in rows[1:]:  # Skip the header row
-            columns = row.find_all('td')
-
-            if len(columns) >= 5:  # Ensure there are enough columns
-                model_name = column_text_extracter(columns[0])
-                retirement_date = column_text_extracter(columns[1])
-                recommended_replacement = f"{column_text_extracter(columns[2])} {column_text_extracter(columns[3])}"
-                
-                model_data.append({
-                    MODEL_NAME: model_name,
-                    RECOMMENDED_REPLACEMENT_MODEL: recommended_replacement,
-                    MODEL_RETIREMENT_DATE: retirement_date,
-                    # MODEL_RETIREMENT_DATE_90DAYS: str(retiring_in_90_days)   ## 90 day retirement logic TBC
-                })
-
-    # Create a DataFrame from the model data
-    return pd.DataFrame(model_data)
+    return AWS_LEGACY_MODELS.rows_dataframe(aws_legacy_models_table)
 
 
-## Main function to extract and save AWS Bedrock Models retirement information
-def aws_model_retirement_information_extractor(url: str):
+## Extracts AWS Bedrock Models retirement information from an already fetched lifecycle page
+def extract_aws_model_retirement_information(page_content: bytes, parser_backend=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    aws_models_dataframes = AWS_BEDROCK_PROVIDER.extract(page_content, parser_backend)
+    return aws_models_dataframes[AWS_ACTIVE_MODELS_TABLE], aws_models_dataframes[AWS_LEGACY_MODELS_TABLE]
+
 
-    # Fetch the webpage content
-    response = requests.get(url, timeout=60)
-    soup = BeautifulSoup(response.content, 'html.parser')
+def process_aws_retirement_dates(aws_active_models_dataframe: pd.DataFrame, aws_legacy_models_dataframe: pd.DataFrame,
+                                 within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> tuple[pd.DataFrame, pd.DataFrame]:
+    ## Active models only have a tentative EOL, so they never count as retiring within the window
+    return (AWS_ACTIVE_MODELS.process_retirement_dates(aws_active_models_dataframe, within_days),
+            AWS_LEGACY_MODELS.process_retirement_dates(aws_legacy_models_dataframe, within_days))
 
 
-    aws_active_models_table = get_aws_active_models(soup)
-    aws_active_models_dataframe = get_aws_active_models_data(aws_active_models_table)
+def save_aws_model_retirement_information(aws_active_models_dataframe: pd.DataFrame,
+                                          aws_legacy_models_dataframe: pd.DataFrame,
+                                          output_file_stem=AWS_OUTPUT_FILE_STEM,
+                                          output_formats=SCRAPER_OUTPUT_FORMATS,
+                                          within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> list:
+    return AWS_BEDROCK_PROVIDER.save({AWS_ACTIVE_MODELS_TABLE: aws_active_models_dataframe,
+                                      AWS_LEGACY_MODELS_TABLE: aws_legacy_models_dataframe},
+                                     output_file_stem, output_formats, within_days)
 
 
-    aws_legacy_models_table = get_aws_legacy_models(soup)
-    aws_legacy_models_dataframe = get_aws_active_models_data(aws_legacy_models_table)
-        
-    with pd.ExcelWriter('aws_bedrock_models_lifecycle.xlsx', engine='openpyxl') as writer:
-        # Write each DataFrame to a different sheet
-        aws_active_models_dataframe.to_excel(writer, sheet_name='Active Models Retirement Details', index=False)
-        aws_legacy_models_dataframe.to_excel(writer, sheet_name='Legacy Models Retirement Details', index=False)
+def record_aws_model_changes(aws_active_models_dataframe: pd.DataFrame, aws_legacy_models_dataframe: pd.DataFrame) -> list:
+    return AWS_BEDROCK_PROVIDER.record_changes({AWS_ACTIVE_MODELS_TABLE: aws_active_models_dataframe,
+                                                AWS_LEGACY_MODELS_TABLE: aws_legacy_models_dataframe})
+
+
+## Main function to extract and save AWS Bedrock Models retirement information
+def aws_model_retirement_information_extractor(url: str, cache: PageCache = None,
+                                               output_file_stem=AWS_OUTPUT_FILE_STEM,
+                                               output_formats=SCRAPER_OUTPUT_FORMATS,
+                                               changes_file=AWS_CHANGES_FILE,
+                                               within_days=MODEL_RETIREMENT_WINDOW_DAYS):
+    update_provider_lifecycle_information(AWS_BEDROCK_PROVIDER, url, cache, output_file_stem, output_formats,
+                                          changes_file, within_days)
 
 
 if __name__ == "__main__":
     aws_model_retirement_information_extractor(AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL)
-    
-
-   
\ No newline at end of file
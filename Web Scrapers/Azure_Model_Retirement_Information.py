@@ -3,27 +3,26 @@
 """
 
 
-import requests
-from bs4 import BeautifulSoup
-
 import pandas as pd
 
-from datetime import datetime, timedelta
-
 import logging
 
 
 ## Import Helper Strings and Helper Functions
-from GenAI_Model_Details_Constants import (AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+from GenAI_Model_Details_Constants import (AZURE_OPENAI,
+                                           AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+                                           PROVIDER_FETCH_TIMEOUT_SECONDS,
+                                           SCRAPER_OUTPUT_FORMATS,
                                            MODEL_NAME,
                                            MODEL_LIFECYCLE_STATUS,
                                            MODEL_RETIREMENT_DATE,
                                            MODEL_VERSION,
                                            RECOMMENDED_REPLACEMENT_MODEL,
-                                           MODEL_RETIREMENT_DATE_90DAYS,
-                                           NO_EARLIER_THAN)
+                                           MODEL_RETIREMENT_WINDOW_DAYS)
 
-from GenAI_Model_Details_Assistant_Functions import column_text_extracter
+from GenAI_Model_Details_Page_Cache import PageCache
+from GenAI_Model_Details_Provider_Registry import (LifecycleProvider, ModelsTable, register_provider,
+                                                   scrape_provider, update_provider_lifecycle_information)
 
 
 # Configure logging
@@ -31,84 +30,88 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
-## Helper Functions
-def highlight_rows(df):
-    # Highlight rows where MODEL_RETIREMENT_DATE_90DAYS column is True in Yellow
-    models_retiring_in_90days = pd.Series(data=False, index=df.index)
-    models_retiring_in_90days[MODEL_RETIREMENT_DATE_90DAYS] = df.loc[MODEL_RETIREMENT_DATE_90DAYS] == "True"
-    return ['background-color: yellow' if models_retiring_in_90days.any() else '' for model in models_retiring_in_90days]
+## Header cells identifying the models tables (one table per model family)
+AZURE_MODELS_TABLE_HEADERS = ("Model", "Version", "Lifecycle status", "Retirement date", "Replacement model")
+
+## Columns identifying a model
+AZURE_MODELS_KEY_COLUMNS = [MODEL_NAME, MODEL_VERSION]
+
+### Name of the models table in the snapshot store
+AZURE_MODELS_TABLE = "Models"
+
+### Name of the saved table (Excel sheet name) and its output file name stem
+AZURE_MODELS_OUTPUT_TABLE = 'Models Retirement Details'
+AZURE_OUTPUT_FILE_STEM = 'azure_openai_models_lifecycle'
+AZURE_CHANGES_FILE = 'azure_openai_models_lifecycle_changes.csv'
+
+
+"""
+Models Table Columns
+    <th>Model</th> --> 0
+    <th>Version</th> --> 1
+    <th>Lifecycle status</th> --> 2
+    <th>Retirement date</th> --> 3
+    <th>Replacement model</th> --> 4
+
+"No earlier than " dates are tentative, so they never count as retiring within the window
+"""
+AZURE_MODELS = ModelsTable(AZURE_MODELS_TABLE, AZURE_MODELS_TABLE_HEADERS,
+                           columns={MODEL_NAME: 0, MODEL_VERSION: 1, MODEL_LIFECYCLE_STATUS: 2,
+                                    RECOMMENDED_REPLACEMENT_MODEL: 4, MODEL_RETIREMENT_DATE: 3},
+                           retirement_date_column=MODEL_RETIREMENT_DATE,
+                           key_columns=AZURE_MODELS_KEY_COLUMNS,
+                           output_table=AZURE_MODELS_OUTPUT_TABLE)
+
+AZURE_OPENAI_PROVIDER = register_provider(LifecycleProvider(AZURE_OPENAI, AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+                                                            (AZURE_MODELS,),
+                                                            output_file_stem=AZURE_OUTPUT_FILE_STEM,
+                                                            changes_file=AZURE_CHANGES_FILE,
+                                                            fetch_timeout=PROVIDER_FETCH_TIMEOUT_SECONDS[AZURE_OPENAI]))
+
+
+def get_azure_models_data(azure_models_tables) -> pd.DataFrame:
+    return AZURE_MODELS.rows_dataframe(azure_models_tables)
+
+
+## Extracts Azure OpenAI Models retirement information from an already fetched lifecycle page
+def extract_azure_model_retirement_information(page_content: bytes, parser_backend=None) -> pd.DataFrame:
+    return AZURE_OPENAI_PROVIDER.extract(page_content, parser_backend)[AZURE_MODELS_TABLE]
+
+
+def process_azure_retirement_dates(model_dataframe: pd.DataFrame, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> pd.DataFrame:
+    return AZURE_MODELS.process_retirement_dates(model_dataframe, within_days)
 
 
 ## Main function to extract and Azure OpenAI Models retirement information
-def azure_model_retirement_information_extractor(url: str) -> pd.DataFrame:
-    # Fetch the webpage content
-    response = requests.get(url, timeout=60)
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Find all tables on the page
-    tables = soup.find_all('table')
-
-
-    # List to store model data
-    model_data = []
-
-    # Iterate through each table
-    for table in tables:
-        rows = table.find_all('tr')
-        
-        for row in rows[1:]:  # Skip the header row
-            columns = row.find_all('td')
-
-            if len(columns) >= 5:  # Ensure there are enough columns
-                model_name = column_text_extracter(columns[0]) #columns[0].text.strip()
-                model_version = column_text_extracter(columns[1]) #columns[1].text.strip()
-                lifecycle_status = column_text_extracter(columns[2]) #columns[2].text.strip()
-                retirement_date = column_text_extracter(columns[3]) #columns[3].text.strip()
-                recommended_replacement = column_text_extracter(columns[4]) #columns[4].text.strip()
-
-
-                # Check if the model is retiring in 90 days -->> Keep retiring_in_90_days as False by default
-                ### This variable can be renamed according to desired threshold retirement date interval (here it is 90 days).
-                retiring_in_90_days = False
-
-                ## If retirement date value exists and doesn't contain the phrase "No earlier than " proceed further
-                if retirement_date:
-                    if (NO_EARLIER_THAN not in retirement_date):
-                        try:
-                            ## collapse multiple spaces to one space, then parse the date value.
-                            ### "%B %d, %Y" format checks for date format of the form "Month-name Day, Year".
-                            retirement_date_cleaned = " ".join(retirement_date.split())
-                            retirement_date_obj = datetime.strptime(retirement_date_cleaned, "%B %d, %Y")
-
-                            ## Check retirement date is within next 90 days. If yes, mark retiring_in_90_days as True.
-                            if retirement_date_obj <= datetime.now() + timedelta(days=90):
-                                retiring_in_90_days = True
-                        except ValueError as e:
-                            print(e)
-
-                
-                model_data.append({
-                    MODEL_NAME: model_name,
-                    MODEL_VERSION: model_version,
-                    MODEL_LIFECYCLE_STATUS: lifecycle_status,
-                    RECOMMENDED_REPLACEMENT_MODEL: recommended_replacement,
-                    MODEL_RETIREMENT_DATE: retirement_date,
-                    MODEL_RETIREMENT_DATE_90DAYS: str(retiring_in_90_days)
-                })
-
-    # Create a DataFrame from the model data
-    return pd.DataFrame(model_data)
-    
-
-def save_azure_model_retirement_information(model_dataframe: pd.DataFrame, excel_file) -> None:
-    # Save the DataFrame to an Excel file
-    model_dataframe.to_excel(excel_file, index=False)
-
-    print(f"Data has been saved to {excel_file}")
+def azure_model_retirement_information_extractor(url: str, cache: PageCache = None,
+                                                 within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> pd.DataFrame:
+    return scrape_provider(AZURE_OPENAI_PROVIDER, url, cache, within_days)[AZURE_MODELS_TABLE]
+
+
+def record_azure_model_changes(model_dataframe: pd.DataFrame) -> list:
+    return AZURE_OPENAI_PROVIDER.record_changes({AZURE_MODELS_TABLE: model_dataframe})
+
+
+def save_azure_model_retirement_information(model_dataframe: pd.DataFrame,
+                                            output_file_stem=AZURE_OUTPUT_FILE_STEM,
+                                            output_formats=SCRAPER_OUTPUT_FORMATS,
+                                            within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> None:
+    # Save the DataFrame in each output format. In Excel, models retiring in within_days days
+    # (the window model_dataframe was processed with) are highlighted in Yellow.
+    saved_files = AZURE_OPENAI_PROVIDER.save({AZURE_MODELS_TABLE: model_dataframe}, output_file_stem, output_formats, within_days)
+
+    print(f"Data has been saved to {', '.join(saved_files)}")
+
 
+## Main function to extract Azure OpenAI Models retirement information and save it if it changed
+def update_azure_model_retirement_information(url: str, cache: PageCache = None,
+                                              output_file_stem=AZURE_OUTPUT_FILE_STEM,
+                                              output_formats=SCRAPER_OUTPUT_FORMATS,
+                                              changes_file=AZURE_CHANGES_FILE,
+                                              within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> None:
+    update_provider_lifecycle_information(AZURE_OPENAI_PROVIDER, url, cache, output_file_stem, output_formats,
+                                          changes_file, within_days)
 
 
 if __name__ == "__main__":
-    azure_model_dataframe = azure_model_retirement_information_extractor(AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL)
-    azure_model_dataframe = azure_model_dataframe.style.apply(highlight_rows, axis=1)
-    save_azure_model_retirement_information (azure_model_dataframe, "azure_openai_models_lifecycle.xlsx")
\ No newline at end of file
+    update_azure_model_retirement_information(AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL)
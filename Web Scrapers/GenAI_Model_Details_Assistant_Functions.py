@@ -3,5 +3,90 @@ Assistant functions for general actions
 """
 
 
+import logging
+import re
+
+import pandas as pd
+
+
+## Import Helper Strings
+from GenAI_Model_Details_Constants import (MODEL_RETIREMENT_DATE_WITHIN_DAYS,
+                                           MODEL_RETIREMENT_WINDOW_DAYS,
+                                           MODEL_RETIREMENT_DATE_PARSED,
+                                           MODEL_RETIREMENT_DATE_TENTATIVE,
+                                           TENTATIVE_DATE_PREFIXES,
+                                           RETIREMENT_DATE_FORMATS)
+
+from GenAI_Model_Details_Scrape_Metrics import (TRANSFORM, ROWS_EXTRACTED, ROWS_DROPPED, DATE_PARSE_FAILURES,
+                                                count_metric, timed_stage)
+
+
+logger = logging.getLogger(__name__)
+
+
 def column_text_extracter(webpage_table_column):
-    return webpage_table_column.text.strip()
\ No newline at end of file
+    return webpage_table_column.text.strip()
+
+
+def table_rows_text(webpage_tables, min_columns=5) -> list:
+    """
+    Text of the data cells of every table row as compact tuples, one tuple per row.
+    The header row of each table and rows with fewer than min_columns cells are skipped.
+    """
+    rows_text = []
+    rows_dropped = 0
+
+    for webpage_table in webpage_tables:
+        for row in webpage_table.find_all('tr')[1:]:  # Skip the header row
+            columns = row.find_all('td', recursive=False)
+
+            if len(columns) >= min_columns:  # Ensure there are enough columns
+                rows_text.append(tuple(map(column_text_extracter, columns)))
+            else:
+                rows_dropped += 1
+
+    count_metric(ROWS_EXTRACTED, len(rows_text))
+    count_metric(ROWS_DROPPED, rows_dropped)
+    return rows_text
+
+
+@timed_stage(TRANSFORM)
+def add_retirement_date_columns(models_dataframe: pd.DataFrame, retirement_date_column: str,
+                                within_days=MODEL_RETIREMENT_WINDOW_DAYS, all_tentative=False) -> pd.DataFrame:
+    """
+    Parse the whole retirement_date_column at once and add:
+        MODEL_RETIREMENT_DATE_PARSED    : retirement date, NaT where missing or unparseable
+        MODEL_RETIREMENT_DATE_TENTATIVE : date carries a tentative prefix ("No earlier than ", ...), or all_tentative
+        Model Retiring in N Days?       : firm (non tentative) date falling before today + within_days
+    """
+    ## collapse multiple spaces to one space, then split off the tentative prefix
+    retirement_dates = models_dataframe[retirement_date_column].fillna('').astype(str).str.split().str.join(' ')
+
+    tentative_prefix = '^(?:' + '|'.join(re.escape(prefix.strip()) for prefix in TENTATIVE_DATE_PREFIXES) + r')\s*'
+    is_tentative = retirement_dates.str.contains(tentative_prefix, case=False, regex=True)
+    retirement_dates = retirement_dates.str.replace(tentative_prefix, '', case=False, regex=True)
+
+    ## Each date format is parsed in one vectorized pass over the dates the previous formats could not parse
+    parsed_dates = pd.Series(pd.NaT, index=models_dataframe.index, dtype='datetime64[ns]')
+    for date_format in RETIREMENT_DATE_FORMATS:
+        unparsed = parsed_dates.isna() & (retirement_dates != '')
+        if not unparsed.any():
+            break
+        parsed_dates[unparsed] = pd.to_datetime(retirement_dates[unparsed], format=date_format, errors='coerce')
+
+    parse_failures = parsed_dates.isna() & (retirement_dates != '')
+    count_metric(DATE_PARSE_FAILURES, parse_failures.sum())
+    if parse_failures.any():
+        logger.warning(f"{parse_failures.sum()} {retirement_date_column} values could not be parsed, "
+                       f"e.g. {retirement_dates[parse_failures].iloc[0]!r}")
+
+    if all_tentative:
+        is_tentative[:] = True
+
+    retirement_window_end = pd.Timestamp.now().normalize() + pd.Timedelta(days=within_days)
+
+    return models_dataframe.assign(**{
+        MODEL_RETIREMENT_DATE_PARSED: parsed_dates,
+        MODEL_RETIREMENT_DATE_TENTATIVE: is_tentative,
+        MODEL_RETIREMENT_DATE_WITHIN_DAYS.format(within_days): ~is_tentative & (parsed_dates <= retirement_window_end),
+    })
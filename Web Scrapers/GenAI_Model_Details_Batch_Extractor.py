@@ -0,0 +1,173 @@
+"""
+    Batch mode of the lifecycle extractors, for many pages of one provider at once: the lifecycle pages of other
+    locales, archived versions, and past snapshots saved for trend analysis.
+
+    URLs are fetched concurrently over one aiohttp session. Parsing and row extraction run in a process pool, so they
+    scale with the CPU cores instead of being serialized by the GIL. Saved pages are read by the workers themselves,
+    and workers send back only the rows as compact tuples of strings, never BeautifulSoup trees.
+    The rows of all pages are combined into one table per models table, with the page each row came from,
+    and written in the output formats.
+
+    Usage:
+        python GenAI_Model_Details_Batch_Extractor.py aws|azure [saved pages or directories ...] [--url URL ...]
+                                                      [--workers 8] [--format parquet ...] [--output-file-stem STEM]
+
+    Tables are located by their (English) header cells, localized pages need their provider's headers declared.
+"""
+
+
+import argparse
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+import pandas as pd
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import (AWS_BEDROCK,
+                                           AZURE_OPENAI,
+                                           SCRAPER_OUTPUT_FORMATS,
+                                           MODEL_RETIREMENT_WINDOW_DAYS,
+                                           SOURCE_PAGE)
+
+from GenAI_Model_Details_Provider_Registry import LIFECYCLE_PROVIDERS
+from GenAI_Model_Details_Concurrent_Scraper import CONNECTION_POOL_SIZE, KEEPALIVE_TIMEOUT_SECONDS, fetch_page_async
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+## Providers selectable on the command line
+BATCH_PROVIDERS = {"aws": AWS_BEDROCK, "azure": AZURE_OPENAI}
+
+## File name pattern of the saved pages in a directory
+SAVED_PAGE_SUFFIX = ".html"
+
+
+def saved_page_paths(paths) -> list:
+    """
+    The given saved pages, with directories expanded to the pages they hold (sorted by name).
+    """
+    page_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            page_paths.extend(sorted(os.path.join(path, file_name) for file_name in os.listdir(path)
+                                     if file_name.endswith(SAVED_PAGE_SUFFIX)))
+        else:
+            page_paths.append(path)
+    return page_paths
+
+
+## Process pool workers. Only the provider name, the page (or its path) and the rows cross the process boundary.
+def extract_page_rows(provider: str, page_content: bytes) -> dict:
+    return LIFECYCLE_PROVIDERS[provider].extract_rows(page_content)
+
+
+def extract_saved_page_rows(provider: str, page_path: str) -> dict:
+    with open(page_path, 'rb') as file:
+        return extract_page_rows(provider, file.read())
+
+
+async def extract_pages_async(provider: str, page_paths, urls, workers=None) -> dict:
+    """
+    Extract the rows of every saved page and URL. Returns source (path or URL) -> table name -> rows,
+    or the exception raised for that source.
+    """
+    loop = asyncio.get_running_loop()
+    lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+
+    with ProcessPoolExecutor(max_workers=workers) as process_pool:
+        async def extract_url_rows(session: aiohttp.ClientSession, url: str) -> dict:
+            ## Each page goes to the pool as soon as it is downloaded, parsing overlaps the remaining downloads
+            page_content = await fetch_page_async(session, url, timeout=lifecycle_provider.fetch_timeout)
+            return await loop.run_in_executor(process_pool, extract_page_rows, provider, page_content)
+
+        extractions = [loop.run_in_executor(process_pool, extract_saved_page_rows, provider, page_path)
+                       for page_path in page_paths]
+
+        connector = aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            extractions.extend(extract_url_rows(session, url) for url in urls)
+            page_rows = await asyncio.gather(*extractions, return_exceptions=True)
+
+    return dict(zip([*page_paths, *urls], page_rows))
+
+
+def combine_page_rows(provider: str, page_rows: dict, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    One DataFrame per models table holding the rows of all pages, SOURCE_PAGE first, with retirement dates processed.
+    """
+    lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+
+    models_dataframes = {}
+    for models_table in lifecycle_provider.models_tables:
+        model_data = [
+            (source, *row)
+            for source, rows_by_table in page_rows.items()
+            for row in rows_by_table[models_table.name]
+        ]
+        models_dataframes[models_table.name] = pd.DataFrame(model_data, columns=[SOURCE_PAGE, *models_table.columns])
+
+    ## One vectorized date parsing pass over all pages
+    return lifecycle_provider.process_retirement_dates(models_dataframes, within_days)
+
+
+## Main function to extract the models tables of many pages of a provider
+def batch_extract(provider: str, page_paths=(), urls=(), workers=None, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    Returns table name -> DataFrame of the rows of all pages. Pages that could not be fetched or extracted are logged and left out.
+    A page given more than once is extracted once.
+    """
+    ## Rows are keyed by their source page, a repeated source would silently overwrite its own rows
+    unique_page_paths, unique_urls = list(dict.fromkeys(page_paths)), list(dict.fromkeys(urls))
+    duplicate_count = len(page_paths) + len(urls) - len(unique_page_paths) - len(unique_urls)
+    if duplicate_count:
+        logger.warning(f"Skipping {duplicate_count} pages given more than once")
+
+    page_rows = asyncio.run(extract_pages_async(provider, unique_page_paths, unique_urls, workers))
+
+    extracted_page_rows = {}
+    for source, rows_by_table in page_rows.items():
+        if isinstance(rows_by_table, BaseException):
+            logger.error(f"Could not extract {source}: {rows_by_table!r}")
+            continue
+        if not any(rows_by_table.values()):
+            ## e.g. a page of another provider, or a page whose table headers changed
+            logger.warning(f"No {provider} model rows found in {source}")
+        extracted_page_rows[source] = rows_by_table
+
+    logger.info(f"Extracted {provider} models tables from {len(extracted_page_rows)} of {len(page_rows)} pages")
+    return combine_page_rows(provider, extracted_page_rows, within_days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the models tables of many lifecycle pages of a provider, in parallel")
+    parser.add_argument('provider', choices=list(BATCH_PROVIDERS), help="Provider the pages belong to")
+    parser.add_argument('pages', nargs='*', help="Saved pages, or directories of saved pages")
+    parser.add_argument('--url', dest='urls', action='append', default=[], help="Page to fetch, can be repeated")
+    parser.add_argument('--workers', type=int, help="Parser processes (default: one per CPU core)")
+    parser.add_argument('--format', dest='output_formats', action='append',
+                        help=f"Output format, can be repeated (default: {', '.join(SCRAPER_OUTPUT_FORMATS)})")
+    parser.add_argument('--output-file-stem', help="Output file name stem (default: the provider's, suffixed with _batch)")
+    arguments = parser.parse_args()
+
+    provider = BATCH_PROVIDERS[arguments.provider]
+    page_paths = saved_page_paths(arguments.pages)
+    if not page_paths and not arguments.urls:
+        parser.error("no pages given, pass saved pages, directories or --url")
+
+    models_dataframes = batch_extract(provider, page_paths, arguments.urls, arguments.workers)
+
+    output_file_stem = arguments.output_file_stem or f"{LIFECYCLE_PROVIDERS[provider].output_file_stem}_batch"
+    saved_files = LIFECYCLE_PROVIDERS[provider].save(models_dataframes, output_file_stem,
+                                                     tuple(arguments.output_formats or SCRAPER_OUTPUT_FORMATS))
+    logger.info(f"Data has been saved to {', '.join(saved_files)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+    This program runs the fetch, parse, extract and save stages of all registered lifecycle providers
+    (see GenAI_Model_Details_Provider_Registry) in one batch.
+
+    All pages are fetched at the same time over one pooled keep-alive aiohttp session, through one page cache.
+    Each page is handed to a shared worker pool for parsing and extraction as soon as it arrives, so parsing
+    overlaps the download of the slower pages. Total run time is set by the slowest page instead of the sum of all pages.
+"""
+
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+
+## Import Helper Strings
+from GenAI_Model_Details_Constants import (PAGE_FETCH_TIMEOUT_SECONDS,
+                                           PAGE_FETCH_RETRIES,
+                                           PAGE_FETCH_BACKOFF_SECONDS,
+                                           SCRAPER_OUTPUT_FORMATS,
+                                           MODEL_RETIREMENT_WINDOW_DAYS)
+
+from GenAI_Model_Details_Page_Cache import PageCache
+from GenAI_Model_Details_Provider_Registry import LIFECYCLE_PROVIDERS
+from GenAI_Model_Details_Scrape_Metrics import (FETCH, CACHE_HIT, CACHE_MISS, CACHE_DISABLED,
+                                                emit_scrape_metrics, provider_run, record_fetch,
+                                                scrape_runs, start_scrape_run, timed_stage)
+from GenAI_Model_Details_Snapshot_Diff import save_model_changes
+
+## Provider plugins, registered in LIFECYCLE_PROVIDERS on import
+import AWS_Bedrock_Model_Retirement_Information
+import Azure_Model_Retirement_Information
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+## File holding the model changes found by the last run
+MODEL_CHANGES_FILE = "genai_models_lifecycle_changes.csv"
+
+## Connection pool settings of the shared session
+CONNECTION_POOL_SIZE = 10
+KEEPALIVE_TIMEOUT_SECONDS = 60
+
+## Worker threads parsing and extracting the fetched pages
+EXTRACTION_WORKERS = 4
+
+
+async def fetch_page_async(session: aiohttp.ClientSession, url: str,
+                           timeout=PAGE_FETCH_TIMEOUT_SECONDS,
+                           retries=PAGE_FETCH_RETRIES,
+                           backoff=PAGE_FETCH_BACKOFF_SECONDS,
+                           cache: PageCache = None):
+    """
+    Fetch one page, retrying failed attempts with exponential backoff (backoff, 2*backoff, 4*backoff, ...).
+    The last failure is raised to the caller.
+    With a cache, a conditional GET is sent and None is returned if the server answers 304 Not Modified.
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+
+    for attempt in range(1, retries + 1):
+        try:
+            with timed_stage(FETCH):
+                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if cache and response.status == 304:
+                        record_fetch(response.status, 0, CACHE_HIT)
+                        return None
+
+                    ## One fetch recorded with the bytes received, error responses included (as fetch_page does)
+                    page_content = await response.read()
+                    record_fetch(response.status, len(page_content), CACHE_MISS if cache else CACHE_DISABLED)
+                    response.raise_for_status()
+
+            if cache:
+                cache.store_page(url, page_content, response.headers)
+            return page_content
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            ## Client errors (other than 429 Too Many Requests) will not go away on retry
+            client_error = isinstance(e, aiohttp.ClientResponseError) and 400 <= e.status < 500 and e.status != 429
+            if attempt == retries or client_error:
+                raise
+
+            delay = backoff * 2 ** (attempt - 1)
+            logger.warning(f"Fetching {url} failed (attempt {attempt}/{retries}): {e!r}. Retrying in {delay}s")
+            await asyncio.sleep(delay)
+
+
+async def scrape_provider_page(session: aiohttp.ClientSession, executor: ThreadPoolExecutor, provider: str,
+                               cache: PageCache, within_days=MODEL_RETIREMENT_WINDOW_DAYS):
+    ## Each provider runs as its own asyncio task, so only this provider's scrape run is active in it
+    with provider_run(provider):
+        lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+        page_content = await fetch_page_async(session, lifecycle_provider.url, timeout=lifecycle_provider.fetch_timeout, cache=cache)
+
+        ## Parsing is CPU bound, keep it off the event loop. The worker runs in a copy of this context,
+        ## so it reports into the same scrape run.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, contextvars.copy_context().run, extract_lifecycle_page,
+                                          provider, lifecycle_provider.url, page_content, cache, within_days)
+
+
+async def scrape_lifecycle_pages_async(providers: list, cache: PageCache, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    Scrape all providers concurrently. Returns provider -> processed models tables, or the exception raised for that provider.
+    """
+    connector = aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS)
+
+    with ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS) as executor:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            scrapes = [scrape_provider_page(session, executor, provider, cache, within_days) for provider in providers]
+            lifecycle_information = await asyncio.gather(*scrapes, return_exceptions=True)
+
+    return dict(zip(providers, lifecycle_information))
+
+
+## Main function to fetch and extract the lifecycle information of all providers
+def scrape_lifecycle_pages(providers=None, cache: PageCache = None, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    Scrape the given providers (default: all registered providers).
+    Returns provider -> processed models tables (table name -> DataFrame).
+    Providers that could not be scraped are logged and left out.
+    Pages not modified since the last run reuse their cached extractor result.
+    """
+    providers = providers or list(LIFECYCLE_PROVIDERS)
+    cache = cache or PageCache()
+
+    unknown_providers = [provider for provider in providers if provider not in LIFECYCLE_PROVIDERS]
+    for provider in unknown_providers:
+        logger.warning(f"No lifecycle provider registered for {provider}, skipping")
+    providers = [provider for provider in providers if provider in LIFECYCLE_PROVIDERS]
+
+    for provider in providers:
+        start_scrape_run(provider, LIFECYCLE_PROVIDERS[provider].url)
+
+    results = {}
+    for provider, lifecycle_information in asyncio.run(scrape_lifecycle_pages_async(providers, cache, within_days)).items():
+        if isinstance(lifecycle_information, BaseException):
+            logger.error(f"Could not scrape {provider} lifecycle page: {lifecycle_information!r}")
+            continue
+
+        results[provider] = lifecycle_information
+
+    return results
+
+
+def extract_lifecycle_page(provider: str, url: str, page_content, cache: PageCache,
+                           within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    Run the provider's extraction (cached per page) and retirement date processing on a fetched page.
+    page_content is None if the page was not modified since it was cached.
+    """
+    lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+    models_dataframes = cache.extract(url, page_content, lifecycle_provider.extract, lifecycle_provider.extraction_version)
+
+    # Retirement windows depend on today's date, so they are computed on every run instead of being cached
+    return lifecycle_provider.process_retirement_dates(models_dataframes, within_days)
+
+
+def save_changed_lifecycle_information(provider: str, lifecycle_information: dict, output_formats=SCRAPER_OUTPUT_FORMATS,
+                                       within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> list:
+    """
+    Record the provider's model changes against its snapshots, and save its tables only if something changed
+    or some of its outputs (e.g. in a newly selected output format) do not exist yet.
+    Returns the non empty change sets.
+    """
+    lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+    model_changes = [changes for changes in lifecycle_provider.record_changes(lifecycle_information) if not changes.empty]
+
+    if model_changes or not lifecycle_provider.outputs_exist(output_formats=output_formats):
+        lifecycle_provider.save(lifecycle_information, output_formats=output_formats, within_days=within_days)
+    return model_changes
+
+
+## Main function to scrape all providers concurrently and save the ones whose models changed
+def update_lifecycle_information(providers=None, output_formats=SCRAPER_OUTPUT_FORMATS,
+                                 within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> None:
+    providers = providers or list(LIFECYCLE_PROVIDERS)
+
+    try:
+        lifecycle_information = scrape_lifecycle_pages(providers, within_days=within_days)
+        model_changes = []
+
+        # Outputs are rewritten only for providers whose models changed, or whose outputs are missing
+        for provider, provider_lifecycle_information in lifecycle_information.items():
+            with provider_run(provider):
+                model_changes.extend(save_changed_lifecycle_information(provider, provider_lifecycle_information,
+                                                                        output_formats, within_days))
+
+        if not save_model_changes(model_changes, MODEL_CHANGES_FILE):
+            logger.info("No model changes since the last run")
+
+    finally:
+        # One metrics record per provider, covering its fetch, extraction and saving
+        emit_scrape_metrics(scrape_runs(providers))
+
+
+if __name__ == "__main__":
+    update_lifecycle_information()
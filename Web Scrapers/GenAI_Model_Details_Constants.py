@@ -2,6 +2,54 @@
 AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL = "https://docs.aws.amazon.com/bedrock/latest/userguide/model-lifecycle.html"
 AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL = "https://learn.microsoft.com/en-us/azure/ai-foundry/openai/concepts/model-retirements"
 
+## Cloud Provider names
+AWS_BEDROCK = "AWS Bedrock"
+AZURE_OPENAI = "Azure OpenAI"
+
+## Lifecycle page of each Cloud Provider. New providers also declare their models tables, see GenAI_Model_Details_Provider_Registry.
+MODEL_LIFECYCLE_PAGE_URLS = {
+    AWS_BEDROCK: AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+    AZURE_OPENAI: AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+}
+
+## Page fetch settings
+PAGE_FETCH_TIMEOUT_SECONDS = 60
+PAGE_FETCH_RETRIES = 3
+PAGE_FETCH_BACKOFF_SECONDS = 2
+
+### Per provider overrides of PAGE_FETCH_TIMEOUT_SECONDS
+PROVIDER_FETCH_TIMEOUT_SECONDS = {
+    AWS_BEDROCK: 60,
+    AZURE_OPENAI: 60,
+}
+
+## Lifecycle watcher settings: poll interval of each provider, random jitter applied to it (fraction of the interval),
+### and the longest pause after repeated errors
+PROVIDER_POLL_INTERVAL_SECONDS = {
+    AWS_BEDROCK: 15 * 60,
+    AZURE_OPENAI: 15 * 60,
+}
+DEFAULT_POLL_INTERVAL_SECONDS = 15 * 60
+POLL_INTERVAL_JITTER = 0.1
+MAX_POLL_BACKOFF_SECONDS = 6 * 60 * 60
+
+## Directory of the on-disk lifecycle page cache (page bodies, ETag / Last-Modified headers, extracted data)
+PAGE_CACHE_DIRECTORY = ".lifecycle_page_cache"
+### Version of the models table extraction code, the cached extracted data of other versions is not reused.
+### Bump it whenever a change to the extraction gives different tables for the same page.
+LIFECYCLE_EXTRACTION_VERSION = 1
+
+## Formats the scrapers write the models tables in: "excel", "parquet", "feather", "csv", "sqlite".
+### Excel is the slowest by far, machine consumers should use the other formats.
+SCRAPER_OUTPUT_FORMATS = ("excel",)
+
+## Directory of the last extracted snapshot of every models table, used to find changes between runs
+MODEL_SNAPSHOT_DIRECTORY = ".lifecycle_snapshots"
+
+## Prometheus text file the scrape metrics are also written to (e.g. in the node_exporter textfile collector directory).
+### None: metrics are only logged, as one JSON line per scrape run
+SCRAPE_METRICS_TEXTFILE = None
+
 
 
 ## Helper Strings
@@ -13,8 +61,38 @@ MODEL_RETIREMENT_DATE = "Model Retirement Date"
 
 MODEL_PROVIDER_NAME = "Model Provider Name"
 
-MODEL_RETIREMENT_DATE_90DAYS = 'Model Retiring in 90 Days?'
+## Retirement date processing columns
+### Template of the "retiring within N days" column name
+MODEL_RETIREMENT_DATE_WITHIN_DAYS = 'Model Retiring in {} Days?'
+MODEL_RETIREMENT_WINDOW_DAYS = 90
+MODEL_RETIREMENT_DATE_90DAYS = MODEL_RETIREMENT_DATE_WITHIN_DAYS.format(MODEL_RETIREMENT_WINDOW_DAYS)
+
+MODEL_RETIREMENT_DATE_PARSED = "Parsed Model Retirement Date"
+MODEL_RETIREMENT_DATE_TENTATIVE = "Model Retirement Date Is Tentative"
+
+## Model Changes Strings
+CLOUD_PROVIDER = "Cloud Provider"
+MODELS_TABLE = "Models Table"
+CHANGE_TYPE = "Change Type"
+CHANGED_COLUMN = "Changed Column"
+VALUE_BEFORE = "Before"
+VALUE_AFTER = "After"
+
+### Change Types
+MODEL_ADDED = "Added"
+MODEL_REMOVED = "Removed"
+MODEL_MODIFIED = "Modified"
+
+## Page each row was extracted from, in batch extractions over many pages
+SOURCE_PAGE = "Source Page"
 
 ## Phrase for tentative dates in Cloud Provider Model Lifecycle Pages
 NO_EARLIER_THAN = "No earlier than "  ### Azure OpenAI
-NO_SOONER_THAT = "No sooner that "    ### AWS Bedrock
\ No newline at end of file
+NO_SOONER_THAT = "No sooner that "    ### AWS Bedrock
+NO_SOONER_THAN = "No sooner than "    ### AWS Bedrock
+
+TENTATIVE_DATE_PREFIXES = (NO_EARLIER_THAN, NO_SOONER_THAT, NO_SOONER_THAN)
+
+## Retirement date formats used in Cloud Provider Model Lifecycle Pages, tried in order
+### "Month-name Day, Year" (Azure OpenAI), "Month/Day/Year" (AWS Bedrock), ISO "Year-Month-Day"
+RETIREMENT_DATE_FORMATS = ("%B %d, %Y", "%m/%d/%Y", "%Y-%m-%d")
\ No newline at end of file
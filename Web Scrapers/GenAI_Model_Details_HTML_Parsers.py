@@ -0,0 +1,69 @@
+"""
+    Pluggable HTML parser layer for the lifecycle page scrapers.
+
+    The C-backed lxml parser is used when installed, with Python's built-in html.parser as fallback.
+    In tables only mode just the <table> subtrees of the page are materialized, the rest of the document is skipped.
+    A table strainer narrows this further to the tables with the given ids.
+
+    bs4 is imported on first parse, so runs answered from the page cache never load it.
+"""
+
+
+from importlib.util import find_spec
+
+
+## Import Helper Functions
+from GenAI_Model_Details_Scrape_Metrics import PARSE, timed_stage
+
+
+## Supported BeautifulSoup parser backends, in order of preference
+LXML = 'lxml'
+HTML_PARSER = 'html.parser'
+HTML_PARSER_BACKENDS = (LXML, HTML_PARSER)
+
+## Python module required by each parser backend (None: part of the standard library)
+HTML_PARSER_BACKEND_MODULES = {
+    LXML: 'lxml',
+    HTML_PARSER: None,
+}
+
+
+def is_parser_backend_available(backend: str) -> bool:
+    module = HTML_PARSER_BACKEND_MODULES[backend]
+    return module is None or find_spec(module) is not None
+
+
+def available_parser_backends() -> list:
+    return [backend for backend in HTML_PARSER_BACKENDS if is_parser_backend_available(backend)]
+
+
+def default_parser_backend() -> str:
+    ## First available backend in order of preference. html.parser is always available.
+    return available_parser_backends()[0]
+
+
+def table_strainer(table_ids=None):
+    """
+    Strainer keeping only <table> elements, optionally only those whose id is in table_ids.
+    """
+    from bs4 import SoupStrainer
+
+    if table_ids:
+        return SoupStrainer('table', id=list(table_ids))
+    return SoupStrainer('table')
+
+
+def make_soup(page_content, backend=None, tables_only=False, parse_only=None):
+    """
+    Parse page_content with the given backend (default: fastest available backend).
+    tables_only: materialize only the <table> elements of the page.
+    parse_only: custom strainer (e.g. from table_strainer), takes precedence over tables_only.
+    """
+    from bs4 import BeautifulSoup
+
+    backend = backend or default_parser_backend()
+    if parse_only is None and tables_only:
+        parse_only = table_strainer()
+
+    with timed_stage(PARSE):
+        return BeautifulSoup(page_content, backend, parse_only=parse_only)
@@ -0,0 +1,147 @@
+"""
+    This program keeps one warm process watching the GenAI model lifecycle pages, instead of starting a fresh
+    interpreter (and importing pandas / bs4) from cron for every check.
+
+    Each provider is polled on its own interval with random jitter, over one shared aiohttp session and with
+    conditional GETs, so an unchanged page costs a single 304 round trip. Polling pauses for the server's
+    Retry-After, or backs off exponentially on errors. Results are emitted (saved) only when the models changed.
+"""
+
+
+import argparse
+import asyncio
+import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import (PROVIDER_POLL_INTERVAL_SECONDS,
+                                           DEFAULT_POLL_INTERVAL_SECONDS,
+                                           POLL_INTERVAL_JITTER,
+                                           MAX_POLL_BACKOFF_SECONDS,
+                                           SCRAPER_OUTPUT_FORMATS)
+
+from GenAI_Model_Details_Page_Cache import PageCache
+from GenAI_Model_Details_Snapshot_Diff import save_model_changes
+from GenAI_Model_Details_Scrape_Metrics import emit_scrape_metrics, provider_run, scrape_runs, start_scrape_run
+
+from GenAI_Model_Details_Concurrent_Scraper import (CONNECTION_POOL_SIZE,
+                                                    KEEPALIVE_TIMEOUT_SECONDS,
+                                                    MODEL_CHANGES_FILE,
+                                                    LIFECYCLE_PROVIDERS,
+                                                    fetch_page_async,
+                                                    extract_lifecycle_page,
+                                                    save_changed_lifecycle_information)
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def retry_after_seconds(response_headers):
+    """
+    Seconds to wait according to a Retry-After header (delay in seconds or HTTP date), None if absent or invalid.
+    """
+    retry_after = response_headers.get('Retry-After') if response_headers else None
+    if not retry_after:
+        return None
+
+    if retry_after.strip().isdigit():
+        return int(retry_after)
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def jittered(interval: float, jitter=POLL_INTERVAL_JITTER) -> float:
+    ## Spread polls over interval +/- jitter, so providers (and watcher instances) don't poll in lockstep
+    return interval * random.uniform(1 - jitter, 1 + jitter)
+
+
+def emit_model_changes(provider: str, lifecycle_information, output_formats=SCRAPER_OUTPUT_FORMATS) -> None:
+    ## Default result emitter: save the provider's tables and append to the changes file, only if its models changed
+    model_changes = save_changed_lifecycle_information(provider, lifecycle_information, output_formats)
+    if model_changes:
+        save_model_changes(model_changes, MODEL_CHANGES_FILE, append=True)
+        logger.info(f"{provider} models changed, changes appended to {MODEL_CHANGES_FILE}")
+
+
+async def watch_provider(session: aiohttp.ClientSession, provider: str, cache: PageCache,
+                         interval: float, emit=emit_model_changes) -> None:
+    url = LIFECYCLE_PROVIDERS[provider].url
+    timeout = LIFECYCLE_PROVIDERS[provider].fetch_timeout
+    consecutive_failures = 0
+
+    while True:
+        ## Every poll is one scrape run, its metrics are emitted once the poll is done
+        start_scrape_run(provider, url)
+
+        try:
+            with provider_run(provider):
+                ## Failed attempts are retried by this loop, with its own backoff, rather than inside the fetch
+                page_content = await fetch_page_async(session, url, timeout=timeout, retries=1, cache=cache)
+
+                if page_content is None:
+                    logger.info(f"{provider} lifecycle page not modified")
+                else:
+                    ## Parsing is CPU bound, keep it off the event loop so other providers' polls stay on time.
+                    ## The worker threads run in a copy of this context, so they report into the same scrape run.
+                    lifecycle_information = await asyncio.to_thread(extract_lifecycle_page, provider, url, page_content, cache)
+                    await asyncio.to_thread(emit, provider, lifecycle_information)
+
+            consecutive_failures = 0
+            delay = jittered(interval)
+
+        except Exception as e:
+            consecutive_failures += 1
+            response_headers = getattr(e, 'headers', None)
+            delay = retry_after_seconds(response_headers)
+
+            if delay is None:
+                delay = jittered(min(interval * 2 ** consecutive_failures, MAX_POLL_BACKOFF_SECONDS))
+            logger.warning(f"Polling {provider} failed ({consecutive_failures} in a row): {e!r}. Next poll in {delay:.0f}s")
+
+        emit_scrape_metrics(scrape_runs([provider]))
+        await asyncio.sleep(delay)
+
+
+async def watch_lifecycle_pages(providers=None, emit=emit_model_changes) -> None:
+    providers = providers or list(LIFECYCLE_PROVIDERS)
+    cache = PageCache()
+
+    connector = aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        watchers = [
+            watch_provider(session, provider, cache,
+                           PROVIDER_POLL_INTERVAL_SECONDS.get(provider, DEFAULT_POLL_INTERVAL_SECONDS), emit)
+            for provider in providers
+        ]
+        await asyncio.gather(*watchers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the GenAI model lifecycle pages and save changes as they appear")
+    parser.add_argument('providers', nargs='*', help=f"Providers to watch (default: all of {list(LIFECYCLE_PROVIDERS)})")
+    arguments = parser.parse_args()
+
+    ## An unknown provider would otherwise stop all the watchers, gathered together
+    unknown_providers = set(arguments.providers) - set(LIFECYCLE_PROVIDERS)
+    if unknown_providers:
+        parser.error(f"unknown providers {sorted(unknown_providers)}, expected some of {list(LIFECYCLE_PROVIDERS)}")
+
+    try:
+        asyncio.run(watch_lifecycle_pages(arguments.providers))
+    except KeyboardInterrupt:
+        logger.info("Lifecycle watcher stopped")
+
+
+if __name__ == "__main__":
+    main()
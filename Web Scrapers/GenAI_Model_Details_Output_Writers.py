@@ -0,0 +1,139 @@
+"""
+    Pluggable output layer for the lifecycle scrapers.
+
+    Models tables can be written as Parquet, Feather or CSV files (one file per table), appended to a local SQLite
+    database (one database table per models table), or exported to an Excel workbook (one sheet per table).
+    Excel goes through openpyxl and is by far the slowest format, machine consumers should use the others.
+    Excel rows flagged in a boolean highlight column are filled in bulk on the worksheet, after the table is written.
+"""
+
+
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+
+## Import Helper Functions
+from GenAI_Model_Details_Scrape_Metrics import WRITE, timed_stage
+
+
+## Output formats
+EXCEL = "excel"
+PARQUET = "parquet"
+FEATHER = "feather"
+CSV = "csv"
+SQLITE = "sqlite"
+
+OUTPUT_FORMATS = (EXCEL, PARQUET, FEATHER, CSV, SQLITE)
+
+OUTPUT_FORMAT_EXTENSIONS = {
+    EXCEL: ".xlsx",
+    PARQUET: ".parquet",
+    FEATHER: ".feather",
+    CSV: ".csv",
+    SQLITE: ".sqlite",
+}
+
+## Column added to rows appended to SQLite, so every scrape stays distinguishable
+SCRAPED_AT = "Scraped At"
+
+## Fill colour of highlighted Excel rows
+EXCEL_HIGHLIGHT_COLOR = 'FFFF00'  # Yellow
+
+
+def table_file_name(table_name: str) -> str:
+    return re.sub(r'\W+', '_', table_name).strip('_').lower()
+
+
+def output_paths(output_file_stem: str, table_names, output_format: str) -> list:
+    """
+    Files written for the given tables in output_format. Excel and SQLite hold all tables in one file.
+    """
+    extension = OUTPUT_FORMAT_EXTENSIONS[output_format]
+    if output_format in (EXCEL, SQLITE):
+        return [f"{output_file_stem}{extension}"]
+    return [f"{output_file_stem}_{table_file_name(table_name)}{extension}" for table_name in table_names]
+
+
+def outputs_exist(output_file_stem: str, table_names, output_formats) -> bool:
+    return all(
+        os.path.exists(path)
+        for output_format in output_formats
+        for path in output_paths(output_file_stem, table_names, output_format)
+    )
+
+
+def highlight_worksheet_rows(worksheet, table: pd.DataFrame, highlight_column: str, color=EXCEL_HIGHLIGHT_COLOR) -> int:
+    """
+    Fill the worksheet rows of table where highlight_column is True. The mask is computed once for the whole column,
+    only the flagged rows are touched. Returns the number of highlighted rows.
+    """
+    ## openpyxl is only needed, and imported, for Excel output
+    from openpyxl.styles import PatternFill
+
+    fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+    highlight_mask = table[highlight_column].fillna(False).to_numpy(dtype=bool)
+    table_columns = range(1, table.shape[1] + 1)
+
+    ## Worksheet rows and columns are 1-based and row 1 holds the header
+    for worksheet_row in (np.flatnonzero(highlight_mask) + 2).tolist():
+        for worksheet_column in table_columns:
+            worksheet.cell(row=worksheet_row, column=worksheet_column).fill = fill
+
+    return int(highlight_mask.sum())
+
+
+def write_excel(model_tables: dict, excel_file: str, highlight_column=None) -> None:
+    with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+        # Write each table to a different sheet
+        for table_name, table in model_tables.items():
+            table.to_excel(writer, sheet_name=table_name, index=False)
+
+            if highlight_column in table.columns:
+                highlight_worksheet_rows(writer.sheets[table_name], table, highlight_column)
+
+
+def append_to_sqlite(model_tables: dict, database_file: str) -> None:
+    scraped_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    with sqlite3.connect(database_file) as connection:
+        for table_name, table in model_tables.items():
+            table = table.assign(**{SCRAPED_AT: scraped_at})
+            table.to_sql(table_file_name(table_name), connection, if_exists='append', index=False)
+
+
+@timed_stage(WRITE)
+def write_model_tables(model_tables: dict, output_file_stem: str, output_formats=(EXCEL,), excel_highlight_column=None) -> list:
+    """
+    Write model_tables (table name -> DataFrame) in each of output_formats.
+    excel_highlight_column: boolean column whose True rows are highlighted in Excel, in the tables that have it.
+    Returns the paths written.
+    """
+    written_paths = []
+
+    for output_format in output_formats:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}, expected one of {OUTPUT_FORMATS}")
+
+        paths = output_paths(output_file_stem, model_tables, output_format)
+
+        if output_format == EXCEL:
+            write_excel(model_tables, paths[0], excel_highlight_column)
+        elif output_format == SQLITE:
+            append_to_sqlite(model_tables, paths[0])
+        else:
+            for table, path in zip(model_tables.values(), paths):
+                if output_format == PARQUET:
+                    table.to_parquet(path, index=False)
+                elif output_format == FEATHER:
+                    table.reset_index(drop=True).to_feather(path)
+                elif output_format == CSV:
+                    table.to_csv(path, index=False)
+
+        written_paths.extend(paths)
+
+    return written_paths
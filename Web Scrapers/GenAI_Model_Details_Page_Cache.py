@@ -0,0 +1,147 @@
+"""
+    On-disk HTTP cache for the GenAI model lifecycle pages.
+
+    Stores each page body along with its ETag / Last-Modified headers, so later runs can send a conditional GET
+    (If-None-Match / If-Modified-Since). When the server answers 304 Not Modified, the previously extracted
+    result is reused and the page is not parsed again.
+"""
+
+
+import hashlib
+import json
+import os
+import pickle
+
+
+## Import Helper Strings
+from GenAI_Model_Details_Constants import PAGE_CACHE_DIRECTORY, PAGE_FETCH_TIMEOUT_SECONDS
+
+from GenAI_Model_Details_Scrape_Metrics import (FETCH, EXTRACT, CACHE_HIT, CACHE_MISS, CACHE_DISABLED,
+                                                record_fetch, timed_stage)
+
+
+## Cache entry file suffixes
+PAGE_BODY_SUFFIX = ".html"
+PAGE_HEADERS_SUFFIX = ".headers.json"
+EXTRACTED_DATA_SUFFIX = ".extracted.pkl"
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    ## Write to a temporary file first, so an interrupted run never leaves a half written cache entry behind
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+class PageCache:
+    def __init__(self, cache_directory=PAGE_CACHE_DIRECTORY):
+        self.cache_directory = cache_directory
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def _entry_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_directory, hashlib.sha256(key.encode()).hexdigest()[:32] + suffix)
+
+
+    ## Page body and validator headers
+    def conditional_headers(self, url: str) -> dict:
+        """
+        Request headers for a conditional GET of url. Empty when the page body is not cached yet.
+        """
+        headers_path = self._entry_path(url, PAGE_HEADERS_SUFFIX)
+        if not (os.path.exists(headers_path) and os.path.exists(self._entry_path(url, PAGE_BODY_SUFFIX))):
+            return {}
+
+        with open(headers_path) as file:
+            validators = json.load(file)
+
+        headers = {}
+        if validators.get('ETag'):
+            headers['If-None-Match'] = validators['ETag']
+        if validators.get('Last-Modified'):
+            headers['If-Modified-Since'] = validators['Last-Modified']
+        return headers
+
+    def store_page(self, url: str, page_content: bytes, response_headers) -> None:
+        validators = {
+            'ETag': response_headers.get('ETag'),
+            'Last-Modified': response_headers.get('Last-Modified'),
+        }
+        _write_atomically(self._entry_path(url, PAGE_BODY_SUFFIX), page_content)
+        _write_atomically(self._entry_path(url, PAGE_HEADERS_SUFFIX), json.dumps(validators).encode())
+
+    def load_page(self, url: str):
+        body_path = self._entry_path(url, PAGE_BODY_SUFFIX)
+        if not os.path.exists(body_path):
+            return None
+        with open(body_path, 'rb') as file:
+            return file.read()
+
+
+    ## Extracted results (DataFrames) of a page, kept per extractor function.
+    ## Only the result of the last page version is kept, with the key of the page content and extractor version it came from.
+    def _extracted_data_path(self, url: str, extractor) -> str:
+        return self._entry_path(f"{url} {extractor.__module__}.{extractor.__qualname__}", EXTRACTED_DATA_SUFFIX)
+
+    @staticmethod
+    def _extracted_data_key(page_content: bytes, extractor_version: str) -> str:
+        extracted_data_key = hashlib.sha256(page_content)
+        extracted_data_key.update(extractor_version.encode())
+        return extracted_data_key.hexdigest()
+
+    def load_extracted(self, url: str, extractor, extracted_data_key: str):
+        extracted_data_path = self._extracted_data_path(url, extractor)
+        if not os.path.exists(extracted_data_path):
+            return None
+        with open(extracted_data_path, 'rb') as file:
+            stored_extraction = pickle.load(file)
+        ## Results stored without their key, by older versions of the cache, are never reused
+        if not (isinstance(stored_extraction, tuple) and stored_extraction[0] == extracted_data_key):
+            return None
+        return stored_extraction[1]
+
+    def store_extracted(self, url: str, extractor, extracted_data_key: str, extracted_data) -> None:
+        _write_atomically(self._extracted_data_path(url, extractor), pickle.dumps((extracted_data_key, extracted_data)))
+
+    def extract(self, url: str, page_content, extractor, extractor_version=""):
+        """
+        Run extractor on page_content and cache its result.
+        page_content is None when the server answered 304: the cached result is returned without parsing
+        if it was extracted from the cached page body by the same extractor_version, else the cached body is parsed.
+        extractor_version must change whenever the extractor would give a different result for the same page.
+        """
+        if page_content is None:
+            page_content = self.load_page(url)
+            extracted_data_key = self._extracted_data_key(page_content, extractor_version)
+            extracted_data = self.load_extracted(url, extractor, extracted_data_key)
+            if extracted_data is not None:
+                return extracted_data
+        else:
+            extracted_data_key = self._extracted_data_key(page_content, extractor_version)
+
+        with timed_stage(EXTRACT):
+            extracted_data = extractor(page_content)
+        self.store_extracted(url, extractor, extracted_data_key, extracted_data)
+        return extracted_data
+
+
+def fetch_page(url: str, timeout=PAGE_FETCH_TIMEOUT_SECONDS, cache: PageCache = None):
+    """
+    Fetch url with a conditional GET against cache.
+    Returns the page content, or None if the server answered 304 Not Modified.
+    """
+    import requests
+
+    with timed_stage(FETCH):
+        response = requests.get(url, headers=cache.conditional_headers(url) if cache else {}, timeout=timeout)
+
+    if cache is not None and response.status_code == 304:
+        record_fetch(response.status_code, 0, CACHE_HIT)
+        return None
+
+    record_fetch(response.status_code, len(response.content), CACHE_MISS if cache is not None else CACHE_DISABLED)
+    response.raise_for_status()
+
+    if cache is not None:
+        cache.store_page(url, response.content, response.headers)
+    return response.content
@@ -0,0 +1,91 @@
+"""
+    Compares parse time and peak memory of the available HTML parser backends on saved copies of the lifecycle pages.
+
+    Usage:
+        python GenAI_Model_Details_Parser_Benchmark.py --download        # save fresh copies of the lifecycle pages first
+        python GenAI_Model_Details_Parser_Benchmark.py page1.html page2.html --repeats 10
+"""
+
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import requests
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import MODEL_LIFECYCLE_PAGE_URLS, PAGE_FETCH_TIMEOUT_SECONDS
+
+from GenAI_Model_Details_HTML_Parsers import available_parser_backends, make_soup
+
+
+## Directory holding the saved copies of the lifecycle pages
+SAVED_PAGES_DIRECTORY = "saved_lifecycle_pages"
+
+
+def saved_page_path(provider: str, pages_directory=SAVED_PAGES_DIRECTORY) -> str:
+    return os.path.join(pages_directory, f"{provider.lower().replace(' ', '_')}_model_lifecycle.html")
+
+
+def download_lifecycle_pages() -> list:
+    os.makedirs(SAVED_PAGES_DIRECTORY, exist_ok=True)
+
+    page_paths = []
+    for provider, url in MODEL_LIFECYCLE_PAGE_URLS.items():
+        response = requests.get(url, timeout=PAGE_FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+
+        page_path = saved_page_path(provider)
+        with open(page_path, 'wb') as file:
+            file.write(response.content)
+        page_paths.append(page_path)
+
+    return page_paths
+
+
+def benchmark_parse(page_content: bytes, backend: str, tables_only: bool, repeats: int) -> tuple:
+    """
+    Returns (best parse time in ms over repeats, peak traced memory in MiB of one parse).
+    """
+    parse_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        make_soup(page_content, backend=backend, tables_only=tables_only)
+        parse_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    make_soup(page_content, backend=backend, tables_only=tables_only)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(parse_times) * 1000, peak_memory / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved lifecycle pages")
+    parser.add_argument('pages', nargs='*', help="Saved HTML pages (default: the pages in the saved pages directory)")
+    parser.add_argument('--download', action='store_true', help="Save fresh copies of the lifecycle pages first")
+    parser.add_argument('--repeats', type=int, default=5, help="Parses per measurement, the best time is reported")
+    arguments = parser.parse_args()
+
+    page_paths = arguments.pages
+    if arguments.download:
+        page_paths = page_paths or download_lifecycle_pages()
+    page_paths = page_paths or [saved_page_path(provider) for provider in MODEL_LIFECYCLE_PAGE_URLS]
+
+    print(f"{'Page':<45} {'Backend':<12} {'Mode':<12} {'Parse ms':>10} {'Peak MiB':>10}")
+    for page_path in page_paths:
+        with open(page_path, 'rb') as file:
+            page_content = file.read()
+
+        for backend in available_parser_backends():
+            for tables_only in (False, True):
+                parse_ms, peak_mib = benchmark_parse(page_content, backend, tables_only, arguments.repeats)
+                mode = "tables only" if tables_only else "full"
+                print(f"{os.path.basename(page_path):<45} {backend:<12} {mode:<12} {parse_ms:>10.1f} {peak_mib:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
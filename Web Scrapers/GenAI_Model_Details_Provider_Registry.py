@@ -0,0 +1,203 @@
+"""
+    Provider plugin registry of the lifecycle scrapers.
+
+    A provider only declares its lifecycle page URL and its models tables: the header cells selecting each table on
+    the page (see GenAI_Model_Details_Table_Index) and which cells of a row hold which output column.
+    Everything else is shared by all providers: fetching through the page cache, parsing, row extraction,
+    retirement date processing, change recording against the snapshot store and saving in the output formats.
+
+    Provider modules declare a LifecycleProvider and register it on import. The concurrent scraper runs all
+    registered providers in one batch.
+"""
+
+
+import json
+import logging
+
+import pandas as pd
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import (PAGE_FETCH_TIMEOUT_SECONDS,
+                                           LIFECYCLE_EXTRACTION_VERSION,
+                                           SCRAPER_OUTPUT_FORMATS,
+                                           MODEL_RETIREMENT_DATE_WITHIN_DAYS,
+                                           MODEL_RETIREMENT_WINDOW_DAYS)
+
+from GenAI_Model_Details_Assistant_Functions import add_retirement_date_columns, table_rows_text
+from GenAI_Model_Details_HTML_Parsers import make_soup
+from GenAI_Model_Details_Table_Index import build_table_index, find_tables_by_headers, locate_tables
+from GenAI_Model_Details_Page_Cache import PageCache, fetch_page
+from GenAI_Model_Details_Output_Writers import outputs_exist, write_model_tables
+from GenAI_Model_Details_Snapshot_Diff import record_model_changes, save_model_changes
+from GenAI_Model_Details_Scrape_Metrics import scrape_run
+
+
+logger = logging.getLogger(__name__)
+
+
+class ModelsTable:
+    """
+    A models table on a provider's lifecycle page.
+        name                   : table name in the snapshot store
+        headers                : header cells selecting the table(s) on the page, in any order
+        columns                : output column -> index of the row cell holding it,
+                                 or a tuple of cell indexes whose texts are joined with a space
+        retirement_date_column : output column holding the retirement date
+        key_columns            : output columns identifying a model, for the snapshot diff
+        output_table           : name of the saved table (Excel sheet name)
+        all_tentative          : every retirement date of the table is tentative, so none counts as retiring soon
+    Rows with too few cells for the mapped columns are skipped.
+    """
+    def __init__(self, name: str, headers: tuple, columns: dict, retirement_date_column: str, key_columns: list,
+                 output_table: str, all_tentative=False):
+        self.name = name
+        self.headers = headers
+        self.columns = columns
+        self.retirement_date_column = retirement_date_column
+        self.key_columns = key_columns
+        self.output_table = output_table
+        self.all_tentative = all_tentative
+
+        cell_indexes = [index for cells in columns.values() for index in (cells if isinstance(cells, tuple) else (cells,))]
+        self.min_columns = max(cell_indexes) + 1
+
+    def rows(self, webpage_tables) -> list:
+        ## Output column values of every row, as compact tuples
+        return [
+            tuple(" ".join(columns[index] for index in cells) if isinstance(cells, tuple) else columns[cells]
+                  for cells in self.columns.values())
+            for columns in table_rows_text(webpage_tables, self.min_columns)
+        ]
+
+    def rows_dataframe(self, webpage_tables) -> pd.DataFrame:
+        return pd.DataFrame(self.rows(webpage_tables), columns=list(self.columns))
+
+    def process_retirement_dates(self, models_dataframe: pd.DataFrame, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> pd.DataFrame:
+        return add_retirement_date_columns(models_dataframe, self.retirement_date_column, within_days, self.all_tentative)
+
+
+class LifecycleProvider:
+    """
+    A Cloud Provider's lifecycle page and the models tables extracted from it.
+    The models DataFrames of a page are passed around as a dict: table name -> DataFrame, in declaration order.
+    """
+    def __init__(self, name: str, url: str, models_tables, output_file_stem: str, changes_file: str,
+                 fetch_timeout=PAGE_FETCH_TIMEOUT_SECONDS):
+        self.name = name
+        self.url = url
+        self.models_tables = tuple(models_tables)
+        self.output_file_stem = output_file_stem
+        self.changes_file = changes_file
+        self.fetch_timeout = fetch_timeout
+
+    ## Extract stage
+    def check_located_tables(self, located_tables: dict) -> dict:
+        ## Tables are selected by their exact header cells: a reworded header would otherwise silently give no rows
+        for models_table in self.models_tables:
+            if not located_tables[models_table.name]:
+                logger.error(f"{self.name} {models_table.name}: no table with the headers {list(models_table.headers)} "
+                             f"on the page, its headers may have changed")
+        return located_tables
+
+    def find_tables(self, soup) -> dict:
+        ## One header index for all the tables of the page
+        table_index = build_table_index(soup)
+        return self.check_located_tables({models_table.name: find_tables_by_headers(table_index, models_table.headers)
+                                          for models_table in self.models_tables})
+
+    def extract_tables(self, located_tables: dict) -> dict:
+        return {models_table.name: models_table.rows_dataframe(located_tables[models_table.name])
+                for models_table in self.models_tables}
+
+    def extract_rows(self, page_content: bytes, parser_backend=None) -> dict:
+        """
+        Table name -> rows (tuples of output column values) of the page. Plain data, cheap to send between processes.
+        Table locations are not cached, pages extracted this way are usually seen once.
+        """
+        located_tables = self.find_tables(make_soup(page_content, backend=parser_backend, tables_only=True))
+        return {models_table.name: models_table.rows(located_tables[models_table.name]) for models_table in self.models_tables}
+
+    @property
+    def extraction_version(self) -> str:
+        ## Extraction code version and table spec, the page cache does not reuse tables extracted with other ones
+        return json.dumps([LIFECYCLE_EXTRACTION_VERSION,
+                           [[models_table.name, models_table.headers, models_table.columns] for models_table in self.models_tables]])
+
+    def extract(self, page_content: bytes, parser_backend=None) -> dict:
+        located_tables = locate_tables(page_content,
+                                       {models_table.name: models_table.headers for models_table in self.models_tables},
+                                       parser_backend=parser_backend)
+        return self.extract_tables(self.check_located_tables(located_tables))
+
+    ## Transform, diff and write stages
+    def process_retirement_dates(self, models_dataframes: dict, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+        return {models_table.name: models_table.process_retirement_dates(models_dataframes[models_table.name], within_days)
+                for models_table in self.models_tables}
+
+    def record_changes(self, models_dataframes: dict) -> list:
+        ## Only the extracted columns are diffed and snapshotted: the retirement date columns added by
+        ## process_retirement_dates depend on today's date and would show up as daily modifications
+        return [record_model_changes(self.name, models_table.name,
+                                     models_dataframes[models_table.name][list(models_table.columns)], models_table.key_columns)
+                for models_table in self.models_tables]
+
+    def output_tables(self, models_dataframes: dict) -> dict:
+        return {models_table.output_table: models_dataframes[models_table.name] for models_table in self.models_tables}
+
+    def outputs_exist(self, output_file_stem=None, output_formats=SCRAPER_OUTPUT_FORMATS) -> bool:
+        output_tables = [models_table.output_table for models_table in self.models_tables]
+        return outputs_exist(output_file_stem or self.output_file_stem, output_tables, output_formats)
+
+    def save(self, models_dataframes: dict, output_file_stem=None, output_formats=SCRAPER_OUTPUT_FORMATS,
+             within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> list:
+        # Each table is written as a different table (a different sheet in Excel).
+        # In Excel, models retiring in within_days days (the window the tables were processed with) are highlighted.
+        return write_model_tables(self.output_tables(models_dataframes), output_file_stem or self.output_file_stem,
+                                  output_formats, excel_highlight_column=MODEL_RETIREMENT_DATE_WITHIN_DAYS.format(within_days))
+
+
+## Registered providers, by name
+LIFECYCLE_PROVIDERS = {}
+
+
+def register_provider(provider: LifecycleProvider) -> LifecycleProvider:
+    LIFECYCLE_PROVIDERS[provider.name] = provider
+    return provider
+
+
+## Shared single provider pipeline
+def scrape_provider(provider: LifecycleProvider, url=None, cache: PageCache = None,
+                    within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> dict:
+    """
+    Fetch, extract and process the retirement dates of the provider's models tables.
+    On 304 Not Modified the previously extracted tables are reused without parsing.
+    """
+    url = url or provider.url
+    cache = cache or PageCache()
+
+    page_content = fetch_page(url, timeout=provider.fetch_timeout, cache=cache)
+    models_dataframes = cache.extract(url, page_content, provider.extract, provider.extraction_version)
+
+    # Retirement windows depend on today's date, so they are computed on every run instead of being cached
+    return provider.process_retirement_dates(models_dataframes, within_days)
+
+
+def update_provider_lifecycle_information(provider: LifecycleProvider, url=None, cache: PageCache = None,
+                                          output_file_stem=None, output_formats=SCRAPER_OUTPUT_FORMATS,
+                                          changes_file=None, within_days=MODEL_RETIREMENT_WINDOW_DAYS) -> None:
+    output_file_stem = output_file_stem or provider.output_file_stem
+
+    # Stage timings and counters of the run are logged as one JSON line when it ends
+    with scrape_run(provider.name, url or provider.url):
+        models_dataframes = scrape_provider(provider, url, cache, within_days)
+
+        # Only the changed rows are written to the changes file. The full tables are rewritten only when something changed.
+        model_changes = provider.record_changes(models_dataframes)
+
+        if (save_model_changes(model_changes, changes_file or provider.changes_file)
+                or not provider.outputs_exist(output_file_stem, output_formats)):
+            saved_files = provider.save(models_dataframes, output_file_stem, output_formats, within_days)
+            logger.info(f"{provider.name} models saved to {', '.join(saved_files)}")
+        else:
+            logger.info(f"No {provider.name} model changes, {output_file_stem} outputs left as is")
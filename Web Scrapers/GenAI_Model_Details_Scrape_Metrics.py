@@ -0,0 +1,244 @@
+"""
+    Per-stage instrumentation of the lifecycle scraper runs.
+
+    A scrape run collects, for one provider: HTTP status, bytes fetched, page cache hit / miss, the time spent in each
+    stage (fetch, parse, extract, transform, diff, write) and counters (rows extracted, rows dropped for having too
+    few columns, retirement dates that could not be parsed). The scraper helpers report into the run active in the
+    current context, and do nothing when no run is active. The extract time includes the parse of the page,
+    and is near zero when a 304 Not Modified lets the cached extraction be reused.
+
+    Each finished run is logged as one JSON line, and optionally written to a Prometheus text file
+    (node_exporter textfile collector format) holding the latest run of every provider scraped by the process.
+
+    Standard library only, so the scraper CLI can import it without loading pandas or bs4.
+"""
+
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+
+## Import Helper Strings
+from GenAI_Model_Details_Constants import SCRAPE_METRICS_TEXTFILE
+
+
+## Stages
+FETCH = "fetch"
+PARSE = "parse"
+EXTRACT = "extract"
+TRANSFORM = "transform"
+DIFF = "diff"
+WRITE = "write"
+
+SCRAPE_STAGES = (FETCH, PARSE, EXTRACT, TRANSFORM, DIFF, WRITE)
+
+## Counters
+ROWS_EXTRACTED = "rows_extracted"
+ROWS_DROPPED = "rows_dropped"
+DATE_PARSE_FAILURES = "date_parse_failures"
+
+SCRAPE_COUNTERS = (ROWS_EXTRACTED, ROWS_DROPPED, DATE_PARSE_FAILURES)
+
+## Page cache outcome of the fetch
+CACHE_HIT = "hit"            ### 304 Not Modified, the cached page is reused
+CACHE_MISS = "miss"          ### page downloaded
+CACHE_DISABLED = "disabled"  ### fetched without a page cache
+
+## Prefix of the Prometheus metric names
+PROMETHEUS_METRIC_PREFIX = "genai_scrape"
+
+
+## Metrics logs go out as bare JSON lines, one per run, whatever the format of the scrapers' own logs
+metrics_logger = logging.getLogger("genai_scrape_metrics")
+if not metrics_logger.handlers:
+    metrics_handler = logging.StreamHandler()
+    metrics_handler.setFormatter(logging.Formatter('%(message)s'))
+    metrics_logger.addHandler(metrics_handler)
+    metrics_logger.setLevel(logging.INFO)
+    metrics_logger.propagate = False
+
+
+class ScrapeMetrics:
+    def __init__(self, provider: str, url: str):
+        self.provider = provider
+        self.url = url
+        self.started_at = datetime.now(timezone.utc)
+
+        self.http_status = None
+        self.bytes_fetched = 0
+        self.cache = None
+        self.succeeded = True
+        self.error = None
+
+        self.stage_seconds = dict.fromkeys(SCRAPE_STAGES, 0.0)
+        self.counters = dict.fromkeys(SCRAPE_COUNTERS, 0)
+
+    @contextlib.contextmanager
+    def active(self):
+        ## Make this the run the scraper helpers report into, for the duration of the block
+        token = _current_metrics.set(self)
+        try:
+            yield self
+        finally:
+            _current_metrics.reset(token)
+
+    def mark_failed(self, error: BaseException) -> None:
+        self.succeeded = False
+        self.error = repr(error)
+
+    def record(self) -> dict:
+        return {
+            'timestamp': self.started_at.isoformat(timespec='seconds'),
+            'provider': self.provider,
+            'url': self.url,
+            'succeeded': self.succeeded,
+            'error': self.error,
+            'http_status': self.http_status,
+            'bytes_fetched': self.bytes_fetched,
+            'cache': self.cache,
+            **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in self.stage_seconds.items()},
+            **self.counters,
+        }
+
+
+## Run active in the current context (thread / asyncio task), and the latest run of each provider
+_current_metrics = contextvars.ContextVar('scrape_metrics', default=None)
+_provider_metrics = {}
+
+## Prometheus text file written on every emit, None to only log
+metrics_textfile = SCRAPE_METRICS_TEXTFILE
+
+
+def set_metrics_textfile(path) -> None:
+    global metrics_textfile
+    metrics_textfile = path
+
+
+## Runs
+def start_scrape_run(provider: str, url: str) -> ScrapeMetrics:
+    metrics = ScrapeMetrics(provider, url)
+    _provider_metrics[provider] = metrics
+    return metrics
+
+
+def scrape_runs(providers) -> list:
+    return [_provider_metrics[provider] for provider in providers if provider in _provider_metrics]
+
+
+@contextlib.contextmanager
+def provider_run(provider: str):
+    """
+    Make the provider's current run active for the block (no-op if the provider has no run), e.g. inside an
+    asyncio task. The run is marked failed if the block raises.
+    """
+    metrics = _provider_metrics.get(provider)
+    if metrics is None:
+        yield None
+        return
+
+    try:
+        with metrics.active():
+            yield metrics
+    except BaseException as e:
+        metrics.mark_failed(e)
+        raise
+
+
+@contextlib.contextmanager
+def scrape_run(provider: str, url: str):
+    """
+    Start a run for provider and make it active for the block. The run is emitted when the block exits.
+    """
+    metrics = start_scrape_run(provider, url)
+    try:
+        with provider_run(provider):
+            yield metrics
+    finally:
+        emit_scrape_metrics([metrics])
+
+
+## Reporting into the active run
+@contextlib.contextmanager
+def timed_stage(stage: str):
+    ## Time spent in a stage adds up, e.g. over the tables of a page
+    metrics = _current_metrics.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.stage_seconds[stage] += time.perf_counter() - start
+
+
+def count_metric(counter: str, value=1) -> None:
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.counters[counter] += int(value)
+
+
+def record_fetch(http_status: int, bytes_fetched: int, cache: str) -> None:
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.http_status = http_status
+        metrics.bytes_fetched = bytes_fetched
+        metrics.cache = cache
+
+
+## Emitting
+def prometheus_text(metrics_runs) -> str:
+    metric_lines = {
+        'succeeded': ("gauge", "1 if the last scrape run succeeded"),
+        'last_run_timestamp_seconds': ("gauge", "Start time of the last scrape run"),
+        'http_status': ("gauge", "HTTP status of the last page fetch"),
+        'fetched_bytes': ("gauge", "Bytes fetched by the last scrape run"),
+        'cache_hit': ("gauge", "1 if the page was not modified since it was cached"),
+        'stage_duration_seconds': ("gauge", "Time spent in each stage of the last scrape run"),
+        **{counter: ("gauge", f"{counter.replace('_', ' ').capitalize()} in the last scrape run") for counter in SCRAPE_COUNTERS},
+    }
+    samples = {metric: [] for metric in metric_lines}
+
+    for metrics in metrics_runs:
+        labels = f'provider="{metrics.provider}"'
+        samples['succeeded'].append((labels, int(metrics.succeeded)))
+        samples['last_run_timestamp_seconds'].append((labels, metrics.started_at.timestamp()))
+        if metrics.http_status is not None:
+            samples['http_status'].append((labels, metrics.http_status))
+        samples['fetched_bytes'].append((labels, metrics.bytes_fetched))
+        samples['cache_hit'].append((labels, int(metrics.cache == CACHE_HIT)))
+        for stage, seconds in metrics.stage_seconds.items():
+            samples['stage_duration_seconds'].append((f'{labels},stage="{stage}"', seconds))
+        for counter, value in metrics.counters.items():
+            samples[counter].append((labels, value))
+
+    lines = []
+    for metric, (metric_type, description) in metric_lines.items():
+        metric_name = f"{PROMETHEUS_METRIC_PREFIX}_{metric}"
+        lines.append(f"# HELP {metric_name} {description}")
+        lines.append(f"# TYPE {metric_name} {metric_type}")
+        lines.extend(f"{metric_name}{{{labels}}} {value}" for labels, value in samples[metric])
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path: str, metrics_runs) -> None:
+    ## Written to a temporary file first, the textfile collector must never read a half written file
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w') as file:
+        file.write(prometheus_text(metrics_runs))
+    os.replace(temporary_path, path)
+
+
+def emit_scrape_metrics(metrics_runs) -> None:
+    """
+    Log each run as a JSON line, and rewrite the Prometheus text file (if set) with the latest run of every provider.
+    """
+    for metrics in metrics_runs:
+        metrics_logger.info(json.dumps({'event': 'scrape_run', **metrics.record()}))
+
+    if metrics_textfile:
+        write_prometheus_textfile(metrics_textfile, _provider_metrics.values())
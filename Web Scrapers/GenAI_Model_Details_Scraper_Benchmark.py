@@ -0,0 +1,246 @@
+"""
+    Offline benchmark of the lifecycle scrapers, stage by stage.
+
+    Saved HTML snapshots of the lifecycle pages (benchmark_fixtures/ by default, or real copies saved with
+    GenAI_Model_Details_Parser_Benchmark.py --download) are scaled to 1x - 100x their table rows and served by a
+    local stand-in HTTP server. The real scraper functions then run against it, timing the fetch, parse, extract,
+    transform (retirement dates) and write stages separately, plus the whole extractor end to end, and the peak
+    traced memory of one staged run. No live Microsoft or AWS page is touched.
+
+    Usage:
+        python GenAI_Model_Details_Scraper_Benchmark.py [aws|azure ...] [--scales 1 10 100] [--repeats 3]
+                                                        [--format parquet ...] [--pages-directory DIR] [--json FILE]
+"""
+
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import AWS_BEDROCK, AZURE_OPENAI, SCRAPER_OUTPUT_FORMATS
+
+from GenAI_Model_Details_HTML_Parsers import HTML_PARSER, make_soup
+from GenAI_Model_Details_Page_Cache import PageCache, fetch_page
+from GenAI_Model_Details_Parser_Benchmark import saved_page_path
+from GenAI_Model_Details_Provider_Registry import LIFECYCLE_PROVIDERS
+from GenAI_Model_Details_Scrape_Metrics import metrics_logger
+
+import AWS_Bedrock_Model_Retirement_Information as aws_scraper
+import Azure_Model_Retirement_Information as azure_scraper
+
+
+## Directory holding the HTML snapshots served to the scrapers
+BENCHMARK_FIXTURES_DIRECTORY = "benchmark_fixtures"
+
+## Table row multipliers of the benchmarked pages
+BENCHMARK_SCALES = (1, 10, 50, 100)
+
+## Benchmarked stages, in pipeline order
+FETCH = "fetch"
+PARSE = "parse"
+EXTRACT = "extract"
+TRANSFORM = "transform"
+WRITE = "write"
+EXTRACTOR = "extractor"
+
+BENCHMARK_STAGES = (FETCH, PARSE, EXTRACT, TRANSFORM, WRITE)
+
+## Providers selectable on the command line
+BENCHMARK_PROVIDERS = {"aws": AWS_BEDROCK, "azure": AZURE_OPENAI}
+
+
+## Page fixtures
+def scale_page(page_content: bytes, scale: int) -> bytes:
+    """
+    Repeat the data rows of every table on the page scale times. The first cells of each copy (model name,
+    version / ID) get a copy number, so the copies stay distinct models for the snapshot diff.
+    """
+    if scale == 1:
+        return page_content
+
+    soup = make_soup(page_content, backend=HTML_PARSER)
+    for table in soup.find_all('table'):
+        data_rows = [row for row in table.find_all('tr') if row.find('td')]
+
+        for copy_number in range(1, scale):
+            for row in data_rows:
+                row_copy = copy.copy(row)
+                for cell in row_copy.find_all('td')[:3]:
+                    cell.string = f"{cell.get_text()} ({copy_number})"
+                row.parent.append(row_copy)
+
+    return str(soup).encode()
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_pages(pages_directory: str):
+    """
+    Serve pages_directory on a free local port for the duration of the block. Yields the server's base URL.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietRequestHandler, directory=pages_directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+## Staged scraper run, returning (stage -> seconds, rows extracted)
+def _timed(stage_times: dict, stage: str, function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    stage_times[stage] = time.perf_counter() - start
+    return result
+
+
+def run_provider_stages(provider: str, url: str, output_file_stem: str, output_formats) -> tuple:
+    lifecycle_provider = LIFECYCLE_PROVIDERS[provider]
+    stage_times = {}
+
+    page_content = _timed(stage_times, FETCH, fetch_page, url)
+    soup = _timed(stage_times, PARSE, make_soup, page_content, tables_only=True)
+    models_dataframes = _timed(stage_times, EXTRACT, lambda: lifecycle_provider.extract_tables(lifecycle_provider.find_tables(soup)))
+    models_dataframes = _timed(stage_times, TRANSFORM, lifecycle_provider.process_retirement_dates, models_dataframes)
+    _timed(stage_times, WRITE, lifecycle_provider.save, models_dataframes, output_file_stem, output_formats)
+
+    return stage_times, sum(len(models_dataframe) for models_dataframe in models_dataframes.values())
+
+
+## Whole extractors, as run by the scraper scripts: fresh page cache, snapshot diff, save
+def run_aws_extractor(url: str, output_file_stem: str, output_formats) -> None:
+    aws_scraper.aws_model_retirement_information_extractor(url, PageCache(), output_file_stem, output_formats,
+                                                           changes_file=f"{output_file_stem}_changes.csv")
+
+
+def run_azure_extractor(url: str, output_file_stem: str, output_formats) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        azure_scraper.update_azure_model_retirement_information(url, PageCache(), output_file_stem, output_formats,
+                                                                changes_file=f"{output_file_stem}_changes.csv")
+
+
+PROVIDER_EXTRACTOR_RUNNERS = {
+    AWS_BEDROCK: run_aws_extractor,
+    AZURE_OPENAI: run_azure_extractor,
+}
+
+
+@contextlib.contextmanager
+def fresh_working_directory():
+    ## Every run starts without page cache, snapshots or outputs, and leaves nothing behind
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as run_directory:
+        os.chdir(run_directory)
+        try:
+            yield run_directory
+        finally:
+            os.chdir(previous_directory)
+
+
+def benchmark_provider(provider: str, url: str, output_formats, repeats: int) -> dict:
+    """
+    Best time of each stage and of the whole extractor over repeats (in ms), rows extracted,
+    and peak traced memory (in MiB) of one staged run.
+    """
+    output_file_stem = provider.lower().replace(' ', '_')
+    stage_runner = partial(run_provider_stages, provider)
+    extractor_runner = PROVIDER_EXTRACTOR_RUNNERS[provider]
+
+    best_times = {}
+    for _ in range(repeats):
+        with fresh_working_directory():
+            stage_times, rows = stage_runner(url, output_file_stem, output_formats)
+        with fresh_working_directory():
+            start = time.perf_counter()
+            extractor_runner(url, output_file_stem, output_formats)
+            stage_times[EXTRACTOR] = time.perf_counter() - start
+
+        for stage, seconds in stage_times.items():
+            best_times[stage] = min(seconds, best_times.get(stage, seconds))
+
+    with fresh_working_directory():
+        tracemalloc.start()
+        stage_runner(url, output_file_stem, output_formats)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        **{f"{stage} ms": seconds * 1000 for stage, seconds in best_times.items()},
+        "rows": rows,
+        "peak MiB": peak_memory / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lifecycle scrapers stage by stage on saved pages, offline")
+    parser.add_argument('providers', nargs='*',
+                        help=f"Providers to benchmark (default: all of {list(BENCHMARK_PROVIDERS)})")
+    parser.add_argument('--scales', type=int, nargs='+', default=BENCHMARK_SCALES, help="Table row multipliers of the pages")
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per measurement, the best time is reported")
+    parser.add_argument('--format', dest='output_formats', action='append',
+                        help=f"Output format of the write stage, can be repeated (default: {', '.join(SCRAPER_OUTPUT_FORMATS)})")
+    parser.add_argument('--pages-directory', default=BENCHMARK_FIXTURES_DIRECTORY, help="Directory of the saved lifecycle pages")
+    parser.add_argument('--json', dest='json_file', help="Also write the results to this JSON file, to compare runs")
+    arguments = parser.parse_args()
+
+    unknown_providers = set(arguments.providers) - set(BENCHMARK_PROVIDERS)
+    if unknown_providers:
+        parser.error(f"unknown providers {sorted(unknown_providers)}, expected some of {list(BENCHMARK_PROVIDERS)}")
+
+    providers = [BENCHMARK_PROVIDERS[provider] for provider in arguments.providers] or list(BENCHMARK_PROVIDERS.values())
+    output_formats = tuple(arguments.output_formats or SCRAPER_OUTPUT_FORMATS)
+
+    ## Scraper progress and metrics logging, and openpyxl's warning about the long AWS sheet names on every write, would drown the report
+    logging.getLogger().setLevel(logging.WARNING)
+    metrics_logger.setLevel(logging.WARNING)
+    warnings.filterwarnings('ignore', message="Title is more than 31 characters")
+
+    results = []
+    print(f"{'Provider':<14} {'Scale':>6} {'Rows':>7} {'Page KiB':>9} "
+          + " ".join(f"{stage.capitalize() + ' ms':>12}" for stage in (*BENCHMARK_STAGES, EXTRACTOR))
+          + f" {'Peak MiB':>9}")
+
+    with tempfile.TemporaryDirectory() as pages_directory, serve_pages(pages_directory) as base_url:
+        for provider in providers:
+            with open(saved_page_path(provider, arguments.pages_directory), 'rb') as file:
+                page_content = file.read()
+
+            for scale in arguments.scales:
+                page_name = f"{provider.lower().replace(' ', '_')}_{scale}x.html"
+                scaled_page = scale_page(page_content, scale)
+                with open(os.path.join(pages_directory, page_name), 'wb') as file:
+                    file.write(scaled_page)
+
+                result = benchmark_provider(provider, f"{base_url}/{page_name}", output_formats, arguments.repeats)
+                result = {"provider": provider, "scale": scale, "page KiB": len(scaled_page) / 2**10, **result}
+                results.append(result)
+
+                print(f"{provider:<14} {scale:>6} {result['rows']:>7} {result['page KiB']:>9.1f} "
+                      + " ".join(f"{result[f'{stage} ms']:>12.1f}" for stage in (*BENCHMARK_STAGES, EXTRACTOR))
+                      + f" {result['peak MiB']:>9.1f}")
+
+    if arguments.json_file:
+        with open(arguments.json_file, 'w') as file:
+            json.dump({"output formats": output_formats, "repeats": arguments.repeats, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+    Command line entry point for the GenAI model lifecycle scrapers.
+
+    Usage:
+        python GenAI_Model_Details_Scraper_CLI.py aws|azure|all|watch [--format parquet --format csv ...] [--import-times]
+                                              [--metrics-textfile genai_scrapers.prom]
+
+    Only the standard library is imported up front. The scraper modules, and with them pandas / requests / aiohttp,
+    are imported when a command actually runs, and bs4 only when a page has to be parsed. So --help is instant,
+    and a run whose pages are all answered 304 Not Modified never loads the HTML parser.
+    --import-times reports how long each deferred import took and which heavy packages the run loaded.
+"""
+
+
+import argparse
+import importlib
+import sys
+import time
+from functools import partial
+
+
+## Import Helper Strings (standard library only, instant to import)
+from GenAI_Model_Details_Constants import (AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+                                           AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+                                           SCRAPER_OUTPUT_FORMATS)
+
+
+## Commands
+AWS = "aws"
+AZURE = "azure"
+ALL = "all"
+WATCH = "watch"
+
+## Output formats accepted by --format (see GenAI_Model_Details_Output_Writers)
+OUTPUT_FORMAT_CHOICES = ("excel", "parquet", "feather", "csv", "sqlite")
+
+## Heavy third party packages reported by --import-times
+HEAVY_PACKAGES = ("pandas", "numpy", "requests", "aiohttp", "bs4", "lxml", "openpyxl", "pyarrow")
+
+
+## Deferred import timings, in import order: (module name, seconds)
+import_times = []
+
+
+def timed_import(module_name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_times.append((module_name, time.perf_counter() - start))
+    return module
+
+
+def report_import_times(startup_seconds: float) -> None:
+    print(f"Startup (argument parsing, helper strings): {startup_seconds * 1000:.1f} ms", file=sys.stderr)
+    for module_name, seconds in import_times:
+        print(f"import {module_name}: {seconds * 1000:.1f} ms (includes its dependencies)", file=sys.stderr)
+
+    loaded_packages = [package for package in HEAVY_PACKAGES if package in sys.modules]
+    print(f"Heavy packages loaded: {', '.join(loaded_packages) or 'none'}", file=sys.stderr)
+
+
+def run_command(command: str, output_formats: tuple) -> None:
+    if command == AWS:
+        aws_scraper = timed_import('AWS_Bedrock_Model_Retirement_Information')
+        aws_scraper.aws_model_retirement_information_extractor(AWS_BEDROCK_MODEL_LIFECYCLE_PAGE_URL,
+                                                               output_formats=output_formats)
+
+    elif command == AZURE:
+        azure_scraper = timed_import('Azure_Model_Retirement_Information')
+        azure_scraper.update_azure_model_retirement_information(AZURE_OPENAI_MODEL_LIFECYCLE_PAGE_URL,
+                                                                output_formats=output_formats)
+
+    elif command == ALL:
+        concurrent_scraper = timed_import('GenAI_Model_Details_Concurrent_Scraper')
+        concurrent_scraper.update_lifecycle_information(output_formats=output_formats)
+
+    elif command == WATCH:
+        lifecycle_watcher = timed_import('GenAI_Model_Details_Lifecycle_Watcher')
+        emit = partial(lifecycle_watcher.emit_model_changes, output_formats=output_formats)
+        try:
+            lifecycle_watcher.asyncio.run(lifecycle_watcher.watch_lifecycle_pages(emit=emit))
+        except KeyboardInterrupt:
+            pass
+
+
+def main():
+    start = time.perf_counter()
+
+    parser = argparse.ArgumentParser(prog="scrape", description="Scrape the GenAI model lifecycle pages")
+    parser.add_argument('command', choices=(AWS, AZURE, ALL, WATCH),
+                        help="aws / azure: scrape one provider, all: scrape all providers concurrently, "
+                             "watch: keep polling all providers and save changes as they appear")
+    parser.add_argument('--format', dest='output_formats', action='append', choices=OUTPUT_FORMAT_CHOICES,
+                        help=f"Output format, can be repeated (default: {', '.join(SCRAPER_OUTPUT_FORMATS)})")
+    parser.add_argument('--import-times', action='store_true', help="Report the import time breakdown of the run")
+    parser.add_argument('--metrics-textfile',
+                        help="Also write the scrape metrics to this Prometheus text file (they are always logged as JSON)")
+    arguments = parser.parse_args()
+
+    output_formats = tuple(arguments.output_formats or SCRAPER_OUTPUT_FORMATS)
+    startup_seconds = time.perf_counter() - start
+
+    if arguments.metrics_textfile:
+        scrape_metrics = timed_import('GenAI_Model_Details_Scrape_Metrics')
+        scrape_metrics.set_metrics_textfile(arguments.metrics_textfile)
+
+    try:
+        run_command(arguments.command, output_formats)
+    finally:
+        if arguments.import_times:
+            report_import_times(startup_seconds)
+
+
+if __name__ == "__main__":
+    main()
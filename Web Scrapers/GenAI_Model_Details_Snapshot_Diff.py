@@ -0,0 +1,140 @@
+"""
+    Incremental diff engine for the GenAI model lifecycle tables.
+
+    The last extracted version of every models table is kept in a keyed snapshot store (Cloud Provider + table,
+    rows keyed by model ID / version). Each new extraction is compared with its snapshot and only the
+    added, removed and modified rows are emitted, with the before and after values of every changed column.
+"""
+
+
+import logging
+import os
+
+import pandas as pd
+
+
+## Import Helper Strings
+from GenAI_Model_Details_Constants import (MODEL_SNAPSHOT_DIRECTORY,
+                                           CLOUD_PROVIDER,
+                                           MODELS_TABLE,
+                                           CHANGE_TYPE,
+                                           CHANGED_COLUMN,
+                                           VALUE_BEFORE,
+                                           VALUE_AFTER,
+                                           MODEL_ADDED,
+                                           MODEL_REMOVED,
+                                           MODEL_MODIFIED)
+
+from GenAI_Model_Details_Scrape_Metrics import DIFF, timed_stage
+
+
+logger = logging.getLogger(__name__)
+
+
+## Column suffixes of the merged previous / current snapshots
+BEFORE_SUFFIX = " (before)"
+AFTER_SUFFIX = " (after)"
+
+
+## Snapshot store
+def snapshot_path(provider: str, table_name: str, snapshot_directory=MODEL_SNAPSHOT_DIRECTORY) -> str:
+    file_name = f"{provider} {table_name}".lower().replace(' ', '_')
+    return os.path.join(snapshot_directory, f"{file_name}.pkl")
+
+
+def load_snapshot(provider: str, table_name: str, snapshot_directory=MODEL_SNAPSHOT_DIRECTORY):
+    path = snapshot_path(provider, table_name, snapshot_directory)
+    if not os.path.exists(path):
+        return None
+    return pd.read_pickle(path)
+
+
+def store_snapshot(provider: str, table_name: str, models_dataframe: pd.DataFrame, snapshot_directory=MODEL_SNAPSHOT_DIRECTORY) -> None:
+    os.makedirs(snapshot_directory, exist_ok=True)
+    models_dataframe.to_pickle(snapshot_path(provider, table_name, snapshot_directory))
+
+
+## Diff stage
+def _unique_by_key(models_dataframe: pd.DataFrame, key_columns: list) -> pd.DataFrame:
+    duplicated_keys = models_dataframe.duplicated(subset=key_columns, keep='last')
+    if duplicated_keys.any():
+        logger.warning(f"{duplicated_keys.sum()} rows with duplicate {key_columns} values, keeping the last of each")
+    return models_dataframe[~duplicated_keys]
+
+
+def diff_model_snapshots(previous: pd.DataFrame, current: pd.DataFrame, key_columns: list) -> pd.DataFrame:
+    """
+    Rows added, removed and modified from previous to current, matched on key_columns.
+    Added / removed rows: key columns + CHANGE_TYPE.
+    Modified rows: one row per changed column, with CHANGED_COLUMN, VALUE_BEFORE and VALUE_AFTER.
+    """
+    output_columns = [*key_columns, CHANGE_TYPE, CHANGED_COLUMN, VALUE_BEFORE, VALUE_AFTER]
+
+    if previous is None:
+        previous = pd.DataFrame(columns=current.columns)
+
+    previous = _unique_by_key(previous, key_columns)
+    current = _unique_by_key(current, key_columns)
+
+    merged = previous.merge(current, on=key_columns, how='outer', suffixes=(BEFORE_SUFFIX, AFTER_SUFFIX), indicator=True)
+
+    changes = [
+        merged.loc[merged['_merge'] == 'right_only', key_columns].assign(**{CHANGE_TYPE: MODEL_ADDED}),
+        merged.loc[merged['_merge'] == 'left_only', key_columns].assign(**{CHANGE_TYPE: MODEL_REMOVED}),
+    ]
+
+    ## Compare each column present in both snapshots, for all rows present in both at once
+    in_both = merged[merged['_merge'] == 'both']
+    value_columns = [column for column in current.columns if column in previous.columns and column not in key_columns]
+
+    for column in value_columns:
+        before = in_both[f"{column}{BEFORE_SUFFIX}"]
+        after = in_both[f"{column}{AFTER_SUFFIX}"]
+        changed = (before != after) & ~(before.isna() & after.isna())
+
+        changes.append(in_both.loc[changed, key_columns].assign(**{
+            CHANGE_TYPE: MODEL_MODIFIED,
+            CHANGED_COLUMN: column,
+            VALUE_BEFORE: before[changed],
+            VALUE_AFTER: after[changed],
+        }))
+
+    changes = [change for change in changes if not change.empty]
+    if not changes:
+        return pd.DataFrame(columns=output_columns)
+
+    return pd.concat(changes, ignore_index=True).reindex(columns=output_columns)
+
+
+@timed_stage(DIFF)
+def record_model_changes(provider: str, table_name: str, current: pd.DataFrame, key_columns: list,
+                         snapshot_directory=MODEL_SNAPSHOT_DIRECTORY) -> pd.DataFrame:
+    """
+    Diff current against the stored snapshot of the table, then make current the new snapshot.
+    Returns the changes, labelled with CLOUD_PROVIDER and MODELS_TABLE. On the first run every row is added.
+    """
+    previous = load_snapshot(provider, table_name, snapshot_directory)
+    changes = diff_model_snapshots(previous, current, key_columns)
+
+    if previous is None or not changes.empty:
+        store_snapshot(provider, table_name, current, snapshot_directory)
+
+    logger.info(f"{provider} {table_name}: {len(changes)} changes since the last snapshot")
+
+    changes.insert(0, MODELS_TABLE, table_name)
+    changes.insert(0, CLOUD_PROVIDER, provider)
+    return changes
+
+
+def save_model_changes(model_changes: list, changes_file: str, append=False) -> bool:
+    """
+    Write the non empty change sets to changes_file (CSV), replacing it or appending to it.
+    Returns False, writing nothing, if there were no changes.
+    """
+    model_changes = [changes for changes in model_changes if not changes.empty]
+    if not model_changes:
+        return False
+
+    append = append and os.path.exists(changes_file)
+    pd.concat(model_changes, ignore_index=True).to_csv(changes_file, index=False, mode='a' if append else 'w', header=not append)
+    return True
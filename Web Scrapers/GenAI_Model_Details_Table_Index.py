@@ -0,0 +1,132 @@
+"""
+    Table fingerprinting index for the lifecycle pages.
+
+    Tables are located by their header signature (the normalized text of their header cells) instead of
+    generated element ids, which change whenever the Cloud Provider regenerates its documentation.
+    The index is built in one pass over the tables of the page. The ids of the located tables are cached
+    with the page's content hash, so later runs on the same page parse only those tables. There is one
+    locations file per set of requested tables (i.e. per lifecycle page), replaced whenever the page changes.
+"""
+
+
+import hashlib
+import json
+import os
+
+
+## Import Helper Strings and Helper Functions
+from GenAI_Model_Details_Constants import PAGE_CACHE_DIRECTORY
+
+from GenAI_Model_Details_HTML_Parsers import make_soup, table_strainer
+from GenAI_Model_Details_Page_Cache import _write_atomically
+
+
+## Table locations cache file suffix
+TABLE_LOCATIONS_SUFFIX = ".tables.json"
+
+
+def normalize_header(header_text: str) -> str:
+    return " ".join(header_text.split()).lower()
+
+
+def table_header_signature(table) -> tuple:
+    """
+    Normalized text of the header cells of the table's first row (data cells if the row has no header cells).
+    """
+    header_row = table.find('tr')
+    if header_row is None:
+        return ()
+
+    header_cells = header_row.find_all('th') or header_row.find_all('td')
+    return tuple(normalize_header(cell.text) for cell in header_cells)
+
+
+def build_table_index(soup) -> dict:
+    """
+    Header signature -> (position in document, table) of the tables with that signature.
+    """
+    table_index = {}
+    for position, table in enumerate(soup.find_all('table')):
+        table_index.setdefault(table_header_signature(table), []).append((position, table))
+    return table_index
+
+
+def find_tables_by_headers(table_index: dict, required_headers) -> list:
+    """
+    Tables whose header signature contains all required_headers (in any order), in document order.
+    """
+    required_headers = {normalize_header(header) for header in required_headers}
+
+    matching_tables = []
+    for signature, positioned_tables in table_index.items():
+        if required_headers.issubset(signature):
+            matching_tables.extend(positioned_tables)
+
+    ## Restore document order across different signatures
+    return [table for _, table in sorted(matching_tables, key=lambda positioned_table: positioned_table[0])]
+
+
+def _table_locations_path(tables_headers: dict, cache_directory: str) -> str:
+    ## Named after the requested headers, which identify the page's tables, not after the page content
+    headers_hash = hashlib.sha256(json.dumps(tables_headers, sort_keys=True).encode()).hexdigest()[:32]
+    return os.path.join(cache_directory, headers_hash + TABLE_LOCATIONS_SUFFIX)
+
+
+def load_table_locations(tables_headers: dict, content_hash: str, cache_directory=PAGE_CACHE_DIRECTORY):
+    """
+    Table name -> ids of the tables located on the page with content_hash, None if the stored locations
+    are of another version of the page (or there are none).
+    """
+    table_locations_path = _table_locations_path(tables_headers, cache_directory)
+    if not os.path.exists(table_locations_path):
+        return None
+    with open(table_locations_path) as file:
+        stored_locations = json.load(file)
+    return stored_locations['table_locations'] if stored_locations.get('content_hash') == content_hash else None
+
+
+def store_table_locations(tables_headers: dict, content_hash: str, table_locations: dict, cache_directory=PAGE_CACHE_DIRECTORY) -> None:
+    ## Replaces the locations of the previous version of the page
+    os.makedirs(cache_directory, exist_ok=True)
+    _write_atomically(_table_locations_path(tables_headers, cache_directory),
+                      json.dumps({'content_hash': content_hash, 'table_locations': table_locations}).encode())
+
+
+def locate_tables(page_content: bytes, tables_headers: dict, parser_backend=None, cache_directory=PAGE_CACHE_DIRECTORY) -> dict:
+    """
+    Locate tables on the page by their headers.
+    tables_headers: table name -> headers the table must have.
+    Returns table name -> matching tables.
+    """
+    ## Page content hash, salted with the requested headers so changing them never reuses stale locations
+    content_hash = hashlib.sha256(page_content)
+    content_hash.update(json.dumps(tables_headers, sort_keys=True).encode())
+    content_hash = content_hash.hexdigest()
+
+    ## Same page seen before: parse only the tables found last time, looked up directly by their ids
+    table_locations = load_table_locations(tables_headers, content_hash, cache_directory)
+    if table_locations is not None:
+        table_ids = [table_id for ids in table_locations.values() for table_id in ids]
+        soup = make_soup(page_content, backend=parser_backend, parse_only=table_strainer(table_ids))
+        return {
+            table_name: [soup.find(id=table_id) for table_id in ids]
+            for table_name, ids in table_locations.items()
+        }
+
+    ## New page: index all tables by header signature in one pass
+    soup = make_soup(page_content, backend=parser_backend, tables_only=True)
+    table_index = build_table_index(soup)
+    located_tables = {
+        table_name: find_tables_by_headers(table_index, headers)
+        for table_name, headers in tables_headers.items()
+    }
+
+    ## Tables can only be looked up directly later if all of them have an id
+    located_table_ids = {
+        table_name: [table.get('id') for table in tables]
+        for table_name, tables in located_tables.items()
+    }
+    if all(table_id for ids in located_table_ids.values() for table_id in ids):
+        store_table_locations(tables_headers, content_hash, located_table_ids, cache_directory)
+
+    return located_tables
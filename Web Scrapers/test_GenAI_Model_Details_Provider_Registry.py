@@ -0,0 +1,40 @@
+"""
+    Tests of the table selection of the lifecycle providers against the benchmark fixture pages.
+"""
+
+
+import logging
+import os
+
+from Azure_Model_Retirement_Information import AZURE_MODELS_TABLE, AZURE_OPENAI_PROVIDER
+
+
+AZURE_FIXTURE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_fixtures",
+                                  "azure_openai_model_lifecycle.html")
+
+
+def read_azure_fixture_page() -> bytes:
+    with open(AZURE_FIXTURE_PAGE, 'rb') as file:
+        return file.read()
+
+
+def test_azure_tables_found_by_headers(tmp_path, monkeypatch, caplog):
+    ## The table locations cache is written to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    with caplog.at_level(logging.ERROR):
+        models_dataframe = AZURE_OPENAI_PROVIDER.extract(read_azure_fixture_page())[AZURE_MODELS_TABLE]
+
+    assert not models_dataframe.empty
+    assert not caplog.records
+
+
+def test_azure_reworded_header_is_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    page_content = read_azure_fixture_page().replace(b"Retirement date", b"Retirement Date (UTC)")
+
+    with caplog.at_level(logging.ERROR):
+        models_dataframe = AZURE_OPENAI_PROVIDER.extract(page_content)[AZURE_MODELS_TABLE]
+
+    assert models_dataframe.empty
+    assert any(AZURE_MODELS_TABLE in record.getMessage() and record.levelno == logging.ERROR for record in caplog.records)